@@ -6,7 +6,7 @@ from .base import BaseDownloader, DownloadStatus, ProgressInfo
 from .ytdlp_downloader import YtDlpDownloader
 from .task_queue import TaskQueue, TaskPriority, QueuedTask
 from .progress_tracker import ProgressTracker, TaskProgress, GlobalProgress
-from .thread_pool import ThreadPoolManager, AdaptiveThreadPoolManager, ThreadPoolStats
+from .thread_pool import ThreadPoolManager, AdaptiveThreadPoolManager, ThreadPoolStats, WorkStealingExecutor
 from .download_manager import DownloadManager, get_download_manager, shutdown_download_manager
 
 __all__ = [
@@ -32,6 +32,7 @@ __all__ = [
     'ThreadPoolManager',
     'AdaptiveThreadPoolManager',
     'ThreadPoolStats',
+    'WorkStealingExecutor',
     
     # Main manager
     'DownloadManager',
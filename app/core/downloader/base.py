@@ -91,7 +91,12 @@ class BaseDownloader(ABC):
         self._callbacks['status'] = callback
     
     def _update_progress(self, progress: ProgressInfo):
-        """Update progress and notify callbacks"""
+        """
+        Update progress and notify callbacks.
+        
+        Downloaders may reuse the same ProgressInfo object between updates,
+        so callbacks that keep it beyond the call must store a copy.
+        """
         self.progress = progress
         if 'progress' in self._callbacks:
             self._callbacks['progress'](progress)
@@ -4,6 +4,7 @@ Download manager that orchestrates all download operations.
 import asyncio
 import logging
 from typing import Dict, List, Optional, Callable, Any
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 
@@ -127,6 +128,11 @@ class DownloadManager:
         await self.thread_pool.stop_adaptive_scaling()
         await self.thread_pool.shutdown(wait=True, timeout=30)
         
+        # Release resources cached by the downloaders
+        ytdlp_downloader = self._downloaders.get('ytdlp')
+        if ytdlp_downloader is not None:
+            ytdlp_downloader.close()
+        
         logger.info("Download manager stopped")
     
     async def add_download(self, 
@@ -337,10 +343,11 @@ class DownloadManager:
             # Get appropriate downloader
             downloader = self._get_downloader_for_url(task.url)
             
-            # Set up progress callbacks
+            # Set up progress callbacks; the tracker keeps the progress object
+            # after the callback returns, so hand it a copy
             downloader.set_progress_callback(
                 lambda progress: asyncio.create_task(
-                    self.progress_tracker.update_task_progress(task.id, progress)
+                    self.progress_tracker.update_task_progress(task.id, replace(progress))
                 )
             )
             
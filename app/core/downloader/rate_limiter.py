@@ -4,7 +4,8 @@ Rate limiting implementation using token bucket algorithm.
 import asyncio
 import time
 import logging
-from typing import Optional
+from collections import deque
+from typing import Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -28,8 +29,11 @@ class TokenBucketRateLimiter:
         self.rate = rate  # bytes per second
         self.capacity = capacity or (rate * 2)  # allow 2 second burst by default
         self.tokens = self.capacity  # start with full bucket
-        self.last_update = time.time()
-        self._lock = asyncio.Lock()
+        self.last_update = time.monotonic()
+        # Created by the first acquire(), since before Python 3.10 an
+        # asyncio.Condition binds to the event loop current at creation
+        self._cond: Optional[asyncio.Condition] = None
+        self._notify_task: Optional[asyncio.Task] = None
         
         logger.info(f"Rate limiter initialized: {rate} bytes/s, capacity: {self.capacity} bytes")
     
@@ -38,40 +42,63 @@ class TokenBucketRateLimiter:
         Acquire tokens for the requested number of bytes.
         This method will block until enough tokens are available.
         
+        Waiters sleep on a condition that is notified whenever the rate
+        changes, so a raised limit takes effect immediately instead of
+        after the originally computed deficit time.
+        
         Args:
             bytes_requested: Number of bytes to acquire tokens for
         """
         if bytes_requested <= 0:
             return
         
-        async with self._lock:
-            await self._wait_for_tokens(bytes_requested)
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        
+        async with self._cond:
+            while not self._try_take(bytes_requested, time.monotonic()):
+                # Sleep until the deficit is refilled or the rate changes
+                tokens_needed = min(bytes_requested, self.capacity) - self.tokens
+                wait_time = tokens_needed / self.rate
+                try:
+                    await asyncio.wait_for(self._cond.wait(), timeout=wait_time)
+                except asyncio.TimeoutError:
+                    pass
+    
+    def _refill(self, now: float) -> None:
+        """Add tokens based on elapsed time up to ``now``"""
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+    
+    def _try_take(self, bytes_requested: int, now: float) -> bool:
+        """Refill the bucket and take tokens if enough are available"""
+        self._refill(now)
+        
+        # Requests larger than the bucket are admitted once it is full
+        # and leave it in debt, otherwise they would never be satisfied
+        if self.tokens >= min(bytes_requested, self.capacity):
             self.tokens -= bytes_requested
+            return True
+        return False
     
-    async def _wait_for_tokens(self, bytes_requested: int) -> None:
-        """Wait until enough tokens are available"""
-        while True:
-            # Refill tokens based on elapsed time
-            now = time.time()
-            elapsed = now - self.last_update
-            self.last_update = now
-            
-            # Add tokens based on rate and elapsed time
-            tokens_to_add = elapsed * self.rate
-            self.tokens = min(self.capacity, self.tokens + tokens_to_add)
-            
-            # Check if we have enough tokens
-            if self.tokens >= bytes_requested:
-                break
-            
-            # Calculate how long to wait for enough tokens
-            tokens_needed = bytes_requested - self.tokens
-            wait_time = tokens_needed / self.rate
-            
-            # Wait for a short time and then check again
-            # We use small increments to allow for cancellation
-            sleep_time = min(wait_time, 0.1)  # Max 100ms sleep
-            await asyncio.sleep(sleep_time)
+    def _notify_waiters(self) -> None:
+        """Wake up waiters so they re-evaluate against the new rate"""
+        if self._cond is None:
+            # Nothing has waited yet
+            return
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No running loop means nobody can be waiting on the condition
+            return
+        self._notify_task = loop.create_task(self._wake_waiters())
+    
+    async def _wake_waiters(self) -> None:
+        """Notify all waiters on the condition"""
+        async with self._cond:
+            self._cond.notify_all()
     
     def set_rate(self, new_rate: float) -> None:
         """
@@ -80,14 +107,27 @@ class TokenBucketRateLimiter:
         Args:
             new_rate: New rate in bytes per second
         """
+        # Account for tokens earned at the old rate before switching
+        self._refill(time.monotonic())
+        old_rate = self.rate
+        
         self.rate = new_rate
         self.capacity = new_rate * 2  # Update capacity proportionally
+        
+        # Scale the fill level with the rate and keep it within the new capacity
+        if old_rate > 0:
+            self.tokens *= new_rate / old_rate
+        self.tokens = min(self.tokens, self.capacity)
+        
+        self._notify_waiters()
         logger.info(f"Rate limit updated to {new_rate} bytes/s")
     
-    def get_current_tokens(self) -> float:
+    def get_current_tokens(self, now: Optional[float] = None) -> float:
         """Get current number of tokens in bucket"""
+        if now is None:
+            now = time.monotonic()
+        
         # Update tokens first
-        now = time.time()
         elapsed = now - self.last_update
         tokens_to_add = elapsed * self.rate
         current_tokens = min(self.capacity, self.tokens + tokens_to_add)
@@ -95,11 +135,12 @@ class TokenBucketRateLimiter:
     
     def get_stats(self) -> dict:
         """Get rate limiter statistics"""
+        current_tokens = self.get_current_tokens()
         return {
             'rate': self.rate,
             'capacity': self.capacity,
-            'current_tokens': self.get_current_tokens(),
-            'utilization': 1.0 - (self.get_current_tokens() / self.capacity)
+            'current_tokens': current_tokens,
+            'utilization': 1.0 - (current_tokens / self.capacity)
         }
 
 
@@ -203,8 +244,19 @@ class AdaptiveRateLimiter(TokenBucketRateLimiter):
 class BandwidthMonitor:
     """
     Monitor bandwidth usage and provide statistics.
+    
+    The monitor is meant to be used from a single event loop. All methods
+    are synchronous and never yield, so updates are already serialized
+    and no lock is needed.
     """
     
+    # Pending bytes are merged into a single sample once either limit is hit
+    FLUSH_THRESHOLD = 64 * 1024  # bytes
+    FLUSH_INTERVAL = 0.05  # seconds
+    
+    # Hard cap on stored samples per second of window
+    MAX_SAMPLES_PER_SEC = 1000
+    
     def __init__(self, window_size: int = 60):
         """
         Initialize bandwidth monitor.
@@ -213,73 +265,91 @@ class BandwidthMonitor:
             window_size: Size of the monitoring window in seconds
         """
         self.window_size = window_size
-        self.data_points = []  # List of (timestamp, bytes) tuples
-        self._lock = asyncio.Lock()
+        # Ring buffer of (timestamp, bytes) tuples with a fixed footprint
+        self.data_points = deque(maxlen=window_size * self.MAX_SAMPLES_PER_SEC)
+        
+        # Transfers are accumulated here and flushed in batches
+        self._pending_bytes = 0
+        self._pending_since = time.monotonic()
     
-    async def record_transfer(self, bytes_transferred: int) -> None:
-        """Record a data transfer"""
-        async with self._lock:
-            now = time.time()
-            self.data_points.append((now, bytes_transferred))
+    def record_transfer(self, bytes_transferred: int, now: Optional[float] = None) -> None:
+        """
+        Record a data transfer.
+        
+        Transfers are batched so the sample list is only updated every
+        FLUSH_THRESHOLD bytes or FLUSH_INTERVAL seconds rather than
+        once per downloaded chunk.
+        
+        Args:
+            bytes_transferred: Number of bytes transferred
+            now: Monotonic timestamp of the transfer (read from the clock if omitted)
+        """
+        if now is None:
+            now = time.monotonic()
+        self._pending_bytes += bytes_transferred
+        if (self._pending_bytes < self.FLUSH_THRESHOLD and
+                now - self._pending_since < self.FLUSH_INTERVAL):
+            return
+        
+        self._flush_pending(now)
+    
+    def _flush_pending(self, now: float) -> None:
+        """Merge pending transfers into one data point"""
+        if self._pending_bytes > 0:
+            self.data_points.append((now, self._pending_bytes))
+            self._pending_bytes = 0
+        self._pending_since = now
+        
+        # Remove old data points outside the window
+        cutoff_time = now - self.window_size
+        data_points = self.data_points
+        while data_points and data_points[0][0] < cutoff_time:
+            data_points.popleft()
+    
+    def _compute_bandwidth(self, now: float) -> Tuple[float, float]:
+        """Compute (current, peak) bandwidth in a single pass over the window"""
+        self._flush_pending(now)
+        
+        # Flushing trimmed the buffer, so every point is within the window
+        if len(self.data_points) < 2:
+            return 0.0, 0.0
+        
+        points = iter(self.data_points)
+        first_time, total_bytes = next(points)
+        prev_time = first_time
+        peak = 0.0
+        for t, b in points:
+            total_bytes += b
             
-            # Remove old data points outside the window
-            cutoff_time = now - self.window_size
-            self.data_points = [(t, b) for t, b in self.data_points if t >= cutoff_time]
+            # Bandwidth between consecutive samples
+            time_diff = t - prev_time
+            if time_diff > 0:
+                peak = max(peak, b / time_diff)
+            prev_time = t
+        
+        time_span = prev_time - first_time
+        current = total_bytes / time_span if time_span > 0 else 0.0
+        return current, peak
     
-    async def get_current_bandwidth(self) -> float:
+    def get_current_bandwidth(self, now: Optional[float] = None) -> float:
         """Get current bandwidth in bytes per second"""
-        async with self._lock:
-            if len(self.data_points) < 2:
-                return 0.0
-            
-            now = time.time()
-            cutoff_time = now - self.window_size
-            
-            # Filter data points within the window
-            recent_points = [(t, b) for t, b in self.data_points if t >= cutoff_time]
-            
-            if len(recent_points) < 2:
-                return 0.0
-            
-            # Calculate total bytes and time span
-            total_bytes = sum(b for t, b in recent_points)
-            time_span = recent_points[-1][0] - recent_points[0][0]
-            
-            if time_span > 0:
-                return total_bytes / time_span
-            else:
-                return 0.0
+        return self._compute_bandwidth(time.monotonic() if now is None else now)[0]
     
-    async def get_peak_bandwidth(self) -> float:
-        """Get peak bandwidth in the current window"""
-        async with self._lock:
-            if len(self.data_points) < 2:
-                return 0.0
-            
-            # Calculate bandwidth for each second
-            bandwidths = []
-            for i in range(len(self.data_points) - 1):
-                time_diff = self.data_points[i + 1][0] - self.data_points[i][0]
-                if time_diff > 0:
-                    bandwidth = self.data_points[i + 1][1] / time_diff
-                    bandwidths.append(bandwidth)
-            
-            return max(bandwidths) if bandwidths else 0.0
+    # The window average is the current bandwidth
+    get_average_bandwidth = get_current_bandwidth
     
-    async def get_average_bandwidth(self) -> float:
-        """Get average bandwidth in the current window"""
-        return await self.get_current_bandwidth()
+    def get_peak_bandwidth(self, now: Optional[float] = None) -> float:
+        """Get peak bandwidth in the current window"""
+        return self._compute_bandwidth(time.monotonic() if now is None else now)[1]
     
-    async def get_stats(self) -> dict:
+    def get_stats(self) -> dict:
         """Get bandwidth statistics"""
-        current = await self.get_current_bandwidth()
-        peak = await self.get_peak_bandwidth()
-        average = await self.get_average_bandwidth()
+        current, peak = self._compute_bandwidth(time.monotonic())
         
         return {
             'current_bandwidth': current,
             'peak_bandwidth': peak,
-            'average_bandwidth': average,
+            'average_bandwidth': current,
             'window_size': self.window_size,
             'data_points': len(self.data_points)
         }
\ No newline at end of file
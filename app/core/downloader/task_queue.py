@@ -3,6 +3,7 @@ Task queue system for managing download tasks.
 """
 import asyncio
 import heapq
+import weakref
 from typing import List, Optional, Callable, Dict, Any
 from dataclasses import dataclass, field
 from enum import Enum
@@ -53,7 +54,8 @@ class TaskQueue:
         self._failed_tasks: List[QueuedTask] = []
         self._lock = asyncio.Lock()
         self._task_callbacks: Dict[str, Callable] = {}
-        self._queue_callbacks: List[Callable] = []
+        # Each entry returns the callback, or None once it has been collected
+        self._queue_callbacks: List[Callable[[], Optional[Callable]]] = []
         
     async def add_task(self, task: DownloadTask, priority: TaskPriority = TaskPriority.NORMAL) -> None:
         """Add a task to the queue"""
@@ -193,18 +195,46 @@ class TaskQueue:
         self.max_concurrent = max(1, max_concurrent)
         logger.info(f"Set max concurrent tasks to {self.max_concurrent}")
     
-    def add_queue_callback(self, callback: Callable) -> None:
-        """Add callback for queue state changes"""
-        self._queue_callbacks.append(callback)
+    def add_queue_callback(self, callback: Callable, keep_alive: bool = False) -> None:
+        """
+        Add callback for queue state changes.
+        
+        Callbacks are held weakly so short-lived UI widgets are not kept
+        alive by the queue and are dropped automatically once collected.
+        
+        Args:
+            callback: Function or bound method to call with the queue status
+            keep_alive: Hold a strong reference, e.g. for lambdas or closures
+                that are not referenced anywhere else
+        """
+        if keep_alive:
+            ref = lambda: callback
+        elif hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            try:
+                ref = weakref.ref(callback)
+            except TypeError:
+                # Not weak-referenceable (e.g. builtins), keep it alive
+                ref = lambda: callback
+        self._queue_callbacks.append(ref)
     
     def remove_queue_callback(self, callback: Callable) -> None:
         """Remove queue callback"""
-        if callback in self._queue_callbacks:
-            self._queue_callbacks.remove(callback)
+        self._queue_callbacks = [
+            ref for ref in self._queue_callbacks
+            if ref() is not None and ref() != callback
+        ]
     
     async def _notify_queue_changed(self) -> None:
         """Notify all callbacks about queue changes"""
-        for callback in self._queue_callbacks:
+        # Drop callbacks whose owners have been garbage collected
+        self._queue_callbacks = [ref for ref in self._queue_callbacks if ref() is not None]
+        
+        for ref in list(self._queue_callbacks):
+            callback = ref()
+            if callback is None:
+                continue
             try:
                 if asyncio.iscoroutinefunction(callback):
                     await callback(self.get_queue_status())
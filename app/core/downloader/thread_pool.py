@@ -3,14 +3,38 @@ Thread pool management for download operations.
 """
 import asyncio
 import concurrent.futures
+import itertools
+import random
 import threading
-from typing import Optional, Callable, Any, Dict, List
+import time
+from collections import deque
+from typing import Optional, Callable, Any, Deque, Dict, List, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Number of lock shards for the active task table (must be a power of two)
+_SHARD_COUNT = 16
+
+# Maximum number of queued submissions handed to the executor per batch
+_SUBMIT_BATCH = 64
+
+# Maximum number of tasks an idle worker steals from a victim at once
+_MAX_STEAL = 32
+
+# Per-thread cache of the worker thread name used in debug logging
+_thread_local = threading.local()
+
+
+def _current_thread_name() -> str:
+    """Get the current thread's name, cached per thread"""
+    name = getattr(_thread_local, 'name', None)
+    if name is None:
+        name = _thread_local.name = threading.current_thread().name
+    return name
+
 
 @dataclass
 class ThreadPoolStats:
@@ -30,6 +54,288 @@ class ThreadPoolStats:
         return (self.active_workers / self.max_workers) * 100
 
 
+class _AtomicCounter:
+    """
+    Counter that can be incremented from any thread without a lock.
+    
+    itertools.count advances atomically in C under the GIL.
+    """
+    
+    __slots__ = ('_count', '_value')
+    
+    def __init__(self):
+        self._count = itertools.count()
+        self._value = 0
+    
+    def increment(self) -> None:
+        """Add one to the counter"""
+        # When increments race, the older value may be stored last; the
+        # value then trails the count until the next increment, and stays
+        # short if none follows. It is never ahead of the count.
+        self._value = next(self._count) + 1
+    
+    @property
+    def value(self) -> int:
+        """Current value"""
+        return self._value
+
+
+class _WorkItem:
+    """A callable submitted to WorkStealingExecutor together with its future"""
+    
+    __slots__ = ('future', 'fn', 'args', 'kwargs')
+    
+    def __init__(self, future: concurrent.futures.Future, fn: Callable, args: tuple, kwargs: dict):
+        self.future = future
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self) -> None:
+        """Run the callable and resolve the future"""
+        if not self.future.set_running_or_notify_cancel():
+            return
+        
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except BaseException as e:
+            self.future.set_exception(e)
+        else:
+            self.future.set_result(result)
+
+
+class _Worker:
+    """Worker thread owning a local task deque"""
+    
+    def __init__(self, executor: 'WorkStealingExecutor', name: str):
+        self.executor = executor
+        self.tasks: Deque[_WorkItem] = deque()
+        # Guards pop-bottom by the owner against pop-top by thieves
+        self.lock = threading.Lock()
+        # Set when the pool shrinks; the worker exits after its current task
+        self.retiring = False
+        self.thread = threading.Thread(target=self._run, name=name, daemon=True)
+    
+    def _pop(self) -> Optional[_WorkItem]:
+        """Take the next task from the own deque"""
+        with self.lock:
+            return self.tasks.pop() if self.tasks else None
+    
+    def _run(self) -> None:
+        """Worker main loop"""
+        executor = self.executor
+        while not self.retiring:
+            item = self._pop() or executor._steal(self)
+            if item is None:
+                if not executor._wait_for_work(self):
+                    break
+                continue
+            
+            item.run()
+            del item
+        
+        if self.retiring:
+            # Hand over anything that reached the deque after retirement
+            with self.lock:
+                items = list(self.tasks)
+                self.tasks.clear()
+            for item in reversed(items):
+                executor._push(item)
+
+
+class WorkStealingExecutor(concurrent.futures.Executor):
+    """
+    Thread pool executor with one task deque per worker.
+    
+    Submissions are distributed round-robin over the workers' deques
+    instead of a single shared queue. A worker takes tasks from its own
+    deque and, when that runs dry, steals up to half of a random victim's
+    tasks. The pool can grow and shrink one worker at a time without
+    disturbing tasks that are already running or queued.
+    """
+    
+    def __init__(self, max_workers: int, thread_name_prefix: str = ""):
+        if max_workers <= 0:
+            raise ValueError("max_workers must be positive")
+        
+        self._thread_name_prefix = thread_name_prefix or "WorkStealingExecutor"
+        self._thread_counter = itertools.count()
+        self._round_robin = itertools.count()
+        self._workers: List[_Worker] = []
+        self._retired: List[_Worker] = []
+        
+        # Idle workers sleep on this condition until work is submitted
+        self._cond = threading.Condition()
+        self._idle = 0
+        self._shutdown = False
+        
+        for _ in range(max_workers):
+            self._start_worker()
+    
+    def _start_worker(self) -> None:
+        """Spawn a new worker thread"""
+        worker = _Worker(self, f"{self._thread_name_prefix}_{next(self._thread_counter)}")
+        self._workers = self._workers + [worker]
+        worker.thread.start()
+    
+    def add_workers(self, count: int) -> None:
+        """
+        Spawn additional worker threads.
+        
+        Args:
+            count: Number of workers to add
+        """
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot add workers after shutdown")
+            for _ in range(count):
+                self._start_worker()
+    
+    def request_shrink(self, count: int) -> None:
+        """
+        Retire worker threads, keeping at least one.
+        
+        Retired workers hand their queued tasks to the remaining workers
+        and exit once their current task has finished.
+        
+        Args:
+            count: Number of workers to retire
+        """
+        with self._cond:
+            count = min(count, len(self._workers) - 1)
+            if count <= 0:
+                return
+            
+            retiring = self._workers[-count:]
+            self._workers = self._workers[:-count]
+            self._retired.extend(retiring)
+            
+            for worker in retiring:
+                with worker.lock:
+                    worker.retiring = True
+                    items = list(worker.tasks)
+                    worker.tasks.clear()
+                
+                # Re-queue oldest first to keep submission order
+                for item in reversed(items):
+                    self._push(item)
+            
+            # Wake sleeping workers so retired ones can exit
+            self._cond.notify_all()
+    
+    @property
+    def num_workers(self) -> int:
+        """Number of worker threads"""
+        return len(self._workers)
+    
+    @property
+    def queued_count(self) -> int:
+        """Number of submitted tasks that have not started yet"""
+        return sum(len(worker.tasks) for worker in self._workers)
+    
+    def submit(self, fn: Callable, *args, **kwargs) -> concurrent.futures.Future:
+        """Schedule a callable and return its future"""
+        if self._shutdown:
+            raise RuntimeError("cannot schedule new futures after shutdown")
+        
+        future = concurrent.futures.Future()
+        self._push(_WorkItem(future, fn, args, kwargs))
+        return future
+    
+    def _push(self, item: _WorkItem) -> None:
+        """Queue a work item on the next worker in round-robin order"""
+        while True:
+            workers = self._workers
+            worker = workers[next(self._round_robin) % len(workers)]
+            with worker.lock:
+                # The worker may have retired since the list was read
+                if not worker.retiring:
+                    worker.tasks.appendleft(item)
+                    break
+        
+        # Only touch the condition when somebody is actually sleeping
+        if self._idle:
+            with self._cond:
+                self._cond.notify()
+    
+    def _steal(self, thief: _Worker) -> Optional[_WorkItem]:
+        """Steal tasks from another worker, returning one to run"""
+        workers = self._workers
+        count = len(workers)
+        start = random.randrange(count)
+        
+        for offset in range(count):
+            victim = workers[(start + offset) % count]
+            if victim is thief or not victim.tasks:
+                continue
+            
+            with victim.lock:
+                steal_count = min(max(len(victim.tasks) // 2, 1), _MAX_STEAL)
+                stolen = [victim.tasks.popleft() for _ in range(min(steal_count, len(victim.tasks)))]
+            
+            if stolen:
+                item = stolen.pop()
+                if stolen:
+                    with thief.lock:
+                        # A retired thief's deque is no longer served
+                        if not thief.retiring:
+                            thief.tasks.extend(stolen)
+                            stolen = None
+                    if stolen:
+                        for extra in reversed(stolen):
+                            self._push(extra)
+                return item
+        
+        return None
+    
+    def _has_work(self) -> bool:
+        """Check whether any worker deque holds tasks"""
+        return any(worker.tasks for worker in self._workers)
+    
+    def _wait_for_work(self, worker: _Worker) -> bool:
+        """
+        Block until work may be available.
+        
+        Returns:
+            False when the calling worker should exit
+        """
+        with self._cond:
+            self._idle += 1
+            try:
+                while not self._has_work():
+                    if self._shutdown or worker.retiring:
+                        return False
+                    self._cond.wait()
+            finally:
+                self._idle -= 1
+        return True
+    
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop accepting work and let the workers exit once idle.
+        
+        Args:
+            wait: Whether to wait for the worker threads to finish
+            cancel_futures: Cancel tasks that have not started yet
+        """
+        with self._cond:
+            self._shutdown = True
+            
+            if cancel_futures:
+                for worker in self._workers:
+                    with worker.lock:
+                        items = list(worker.tasks)
+                        worker.tasks.clear()
+                    for item in items:
+                        item.future.cancel()
+            
+            self._cond.notify_all()
+        
+        if wait:
+            for worker in self._workers + self._retired:
+                worker.thread.join()
+
+
 class ThreadPoolManager:
     """
     Manages thread pools for download operations.
@@ -39,29 +345,75 @@ class ThreadPoolManager:
     def __init__(self, max_workers: int = 4, thread_name_prefix: str = "DownloadWorker"):
         self.max_workers = max_workers
         self.thread_name_prefix = thread_name_prefix
-        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
-        self._active_tasks: Dict[str, concurrent.futures.Future] = {}
-        self._completed_tasks = 0
-        self._failed_tasks = 0
+        self._executor: Optional[WorkStealingExecutor] = None
+        
+        # Active tasks are sharded by task ID so unrelated tasks never
+        # contend on the same lock. The event loop is the only writer and
+        # never awaits inside a check-then-update, so coroutines need no
+        # extra lock; shard locks are held for single dict updates only,
+        # to stay consistent with readers on other threads.
+        self._shards: List[Tuple[threading.Lock, Dict[str, concurrent.futures.Future]]] = [
+            (threading.Lock(), {}) for _ in range(_SHARD_COUNT)
+        ]
+        self._completed_tasks = _AtomicCounter()
+        self._failed_tasks = _AtomicCounter()
         self._created_at = datetime.now()
-        self._lock = threading.Lock()
         self._shutdown = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Submissions are queued here and handed to the executor in batches
+        # by a dedicated thread, keeping executor locking off the event loop
+        self._pending: Deque[Tuple[concurrent.futures.Future, str, Callable, tuple, dict]] = deque()
+        self._wake = threading.Event()
         
         # Initialize the thread pool
         self._create_executor()
+        
+        self._submitter = threading.Thread(
+            target=self._submitter_loop,
+            name=f"{thread_name_prefix}-Submitter",
+            daemon=True
+        )
+        self._submitter.start()
     
     def _create_executor(self) -> None:
         """Create the thread pool executor"""
-        if self._executor is not None:
-            self._executor.shutdown(wait=False)
-        
-        self._executor = concurrent.futures.ThreadPoolExecutor(
+        self._executor = WorkStealingExecutor(
             max_workers=self.max_workers,
             thread_name_prefix=self.thread_name_prefix
         )
         
         logger.info(f"Created thread pool with {self.max_workers} workers")
     
+    def _get_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the event loop driving this manager, cached on first use"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            loop = self._loop = asyncio.get_running_loop()
+        return loop
+    
+    def _shard(self, task_id: str) -> Tuple[threading.Lock, Dict[str, concurrent.futures.Future]]:
+        """Get the (lock, tasks) shard responsible for a task ID"""
+        return self._shards[hash(task_id) & (_SHARD_COUNT - 1)]
+    
+    def _pop_task(self, task_id: str) -> None:
+        """Remove a task from the active task table"""
+        lock, tasks = self._shard(task_id)
+        with lock:
+            tasks.pop(task_id, None)
+    
+    def _all_futures(self) -> List[concurrent.futures.Future]:
+        """Snapshot the futures of all active tasks"""
+        futures = []
+        for lock, tasks in self._shards:
+            with lock:
+                futures.extend(tasks.values())
+        return futures
+    
+    def _active_count(self) -> int:
+        """Count active tasks across all shards"""
+        return sum(len(tasks) for _, tasks in self._shards)
+    
     async def submit_task(self, 
                          task_id: str, 
                          func: Callable, 
@@ -85,34 +437,79 @@ class ThreadPoolManager:
         if self._executor is None:
             raise RuntimeError("Thread pool not initialized")
         
-        with self._lock:
-            if task_id in self._active_tasks:
-                raise ValueError(f"Task {task_id} is already active")
+        lock, tasks = self._shard(task_id)
+        if task_id in tasks:
+            raise ValueError(f"Task {task_id} is already active")
+        
+        # Queue the task for the submitter thread
+        future = concurrent.futures.Future()
+        with lock:
+            tasks[task_id] = future
+        self._pending.append((future, task_id, func, args, kwargs))
+        self._wake.set()
+        
+        logger.debug(f"Submitted task {task_id} to thread pool")
+        return future
+    
+    def _submitter_loop(self) -> None:
+        """Drain queued submissions into the executor in batches"""
+        while True:
+            self._wake.wait()
+            self._wake.clear()
             
-            # Submit the task
-            future = self._executor.submit(self._wrap_task, task_id, func, *args, **kwargs)
-            self._active_tasks[task_id] = future
+            while self._pending:
+                batch = [
+                    self._pending.popleft()
+                    for _ in range(min(len(self._pending), _SUBMIT_BATCH))
+                ]
+                executor = self._executor
+                for item in batch:
+                    future = item[0]
+                    try:
+                        if executor is None:
+                            raise RuntimeError("Thread pool is shut down")
+                        executor.submit(self._run_task, *item)
+                    except RuntimeError as e:
+                        if future.set_running_or_notify_cancel():
+                            future.set_exception(e)
             
-            logger.debug(f"Submitted task {task_id} to thread pool")
-            return future
+            if self._shutdown and not self._pending:
+                break
+    
+    def _run_task(self,
+                  future: concurrent.futures.Future,
+                  task_id: str,
+                  func: Callable,
+                  args: tuple,
+                  kwargs: dict) -> None:
+        """Run a queued task and resolve its future"""
+        # Skip tasks that were cancelled while queued
+        if not future.set_running_or_notify_cancel():
+            return
+        
+        try:
+            result = self._wrap_task(task_id, func, *args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
     
     def _wrap_task(self, task_id: str, func: Callable, *args, **kwargs) -> Any:
         """Wrapper for tasks to handle completion tracking"""
         try:
-            logger.debug(f"Starting task {task_id} in thread {threading.current_thread().name}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Starting task {task_id} in thread {_current_thread_name()}")
             result = func(*args, **kwargs)
             
             # Don't remove from active_tasks here - let wait_for_task handle it
-            with self._lock:
-                self._completed_tasks += 1
+            self._completed_tasks.increment()
             
             logger.debug(f"Completed task {task_id}")
             return result
             
         except Exception as e:
             # Don't remove from active_tasks here - let wait_for_task handle it
-            with self._lock:
-                self._failed_tasks += 1
+            self._failed_tasks.increment()
             
             logger.error(f"Task {task_id} failed: {e}")
             raise e
@@ -127,18 +524,17 @@ class ThreadPoolManager:
         Returns:
             True if task was cancelled, False if not found or already completed
         """
-        with self._lock:
-            if task_id not in self._active_tasks:
-                return False
-            
-            future = self._active_tasks[task_id]
-            cancelled = future.cancel()
-            
-            if cancelled:
-                del self._active_tasks[task_id]
-                logger.info(f"Cancelled task {task_id}")
-            
-            return cancelled
+        future = self._shard(task_id)[1].get(task_id)
+        if future is None:
+            return False
+        
+        cancelled = future.cancel()
+        
+        if cancelled:
+            self._pop_task(task_id)
+            logger.info(f"Cancelled task {task_id}")
+        
+        return cancelled
     
     async def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Any:
         """
@@ -156,33 +552,29 @@ class ThreadPoolManager:
             TimeoutError: If timeout exceeded
             Exception: If task failed
         """
-        with self._lock:
-            if task_id not in self._active_tasks:
-                raise KeyError(f"Task {task_id} not found")
-            
-            future = self._active_tasks[task_id]
+        future = self._shard(task_id)[1].get(task_id)
+        if future is None:
+            raise KeyError(f"Task {task_id} not found")
+        
+        # Wait for completion on the event loop instead of parking a thread
+        waiter = asyncio.wrap_future(future, loop=self._get_loop())
+        done, _ = await asyncio.wait({waiter}, timeout=timeout)
+        if not done:
+            # The task keeps running, its outcome is collected later
+            waiter.add_done_callback(self._consume_result)
+            raise TimeoutError(f"Task {task_id} timed out after {timeout} seconds")
         
-        # Wait for completion
-        loop = asyncio.get_event_loop()
+        self._consume_result(waiter)
         try:
-            result = await loop.run_in_executor(
-                None, 
-                lambda: future.result(timeout=timeout)
-            )
+            result = future.result()
             
             # Clean up completed task
-            with self._lock:
-                if task_id in self._active_tasks:
-                    del self._active_tasks[task_id]
+            self._pop_task(task_id)
             
             return result
-        except concurrent.futures.TimeoutError:
-            raise TimeoutError(f"Task {task_id} timed out after {timeout} seconds")
         except Exception as e:
             # Clean up failed task
-            with self._lock:
-                if task_id in self._active_tasks:
-                    del self._active_tasks[task_id]
+            self._pop_task(task_id)
             raise e
     
     async def wait_for_all(self, timeout: Optional[float] = None) -> List[Any]:
@@ -195,52 +587,70 @@ class ThreadPoolManager:
         Returns:
             List of task results
         """
-        with self._lock:
-            futures = list(self._active_tasks.values())
+        futures = self._all_futures()
         
         if not futures:
             return []
         
-        loop = asyncio.get_event_loop()
-        try:
-            done, pending = await loop.run_in_executor(
-                None,
-                lambda: concurrent.futures.wait(futures, timeout=timeout)
-            )
-            
-            results = []
-            for future in done:
-                try:
-                    results.append(future.result())
-                except Exception as e:
-                    logger.error(f"Task failed: {e}")
-                    results.append(e)
-            
-            return results
-            
-        except concurrent.futures.TimeoutError:
-            raise TimeoutError(f"Not all tasks completed within {timeout} seconds")
+        loop = self._get_loop()
+        waiters = {asyncio.wrap_future(future, loop=loop): future for future in futures}
+        done, pending = await asyncio.wait(waiters, timeout=timeout)
+        
+        for waiter in pending:
+            waiter.add_done_callback(self._consume_result)
+        
+        results = []
+        for waiter in done:
+            self._consume_result(waiter)
+            try:
+                results.append(waiters[waiter].result())
+            except Exception as e:
+                logger.error(f"Task failed: {e}")
+                results.append(e)
+        
+        return results
+    
+    @staticmethod
+    def _consume_result(waiter: asyncio.Future) -> None:
+        """Mark the outcome of a wrapped future as retrieved"""
+        if not waiter.cancelled():
+            waiter.exception()
+    
+    def get_counts(self) -> Tuple[int, int, int, int]:
+        """
+        Get the raw task counters without building a ThreadPoolStats.
+        
+        Returns:
+            Tuple of (active_workers, queued_tasks, completed_tasks, failed_tasks)
+        """
+        return (
+            self._active_count(),
+            self._get_queued_task_count(),
+            self._completed_tasks.value,
+            self._failed_tasks.value
+        )
     
     def get_stats(self) -> ThreadPoolStats:
         """Get thread pool statistics"""
-        with self._lock:
-            return ThreadPoolStats(
-                max_workers=self.max_workers,
-                active_workers=len(self._active_tasks),
-                queued_tasks=self._get_queued_task_count(),
-                completed_tasks=self._completed_tasks,
-                failed_tasks=self._failed_tasks,
-                created_at=self._created_at
-            )
+        active_workers, queued_tasks, completed_tasks, failed_tasks = self.get_counts()
+        
+        return ThreadPoolStats(
+            max_workers=self.max_workers,
+            active_workers=active_workers,
+            queued_tasks=queued_tasks,
+            completed_tasks=completed_tasks,
+            failed_tasks=failed_tasks,
+            created_at=self._created_at
+        )
     
     def _get_queued_task_count(self) -> int:
         """Get number of queued tasks (approximation)"""
         if self._executor is None:
             return 0
         
-        # This is an approximation since ThreadPoolExecutor doesn't expose queue size
-        # We can estimate based on submitted vs active tasks
-        return max(0, len(self._active_tasks) - self.max_workers)
+        # Tasks still waiting for the submitter thread plus tasks sitting in
+        # the worker deques
+        return len(self._pending) + self._executor.queued_count
     
     def resize_pool(self, new_max_workers: int) -> None:
         """
@@ -258,27 +668,40 @@ class ThreadPoolManager:
         old_max_workers = self.max_workers
         self.max_workers = new_max_workers
         
-        # Recreate the executor with new size
-        self._create_executor()
+        # Add or retire only the difference; running and queued tasks
+        # are not disturbed
+        if self._executor is not None:
+            delta = new_max_workers - old_max_workers
+            if delta > 0:
+                self._executor.add_workers(delta)
+            else:
+                self._executor.request_shrink(-delta)
         
         logger.info(f"Resized thread pool from {old_max_workers} to {new_max_workers} workers")
     
     def is_task_active(self, task_id: str) -> bool:
         """Check if a task is currently active"""
-        with self._lock:
-            return task_id in self._active_tasks
+        lock, tasks = self._shard(task_id)
+        with lock:
+            return task_id in tasks
     
     def get_active_task_ids(self) -> List[str]:
         """Get list of active task IDs"""
-        with self._lock:
-            return list(self._active_tasks.keys())
+        task_ids = []
+        for lock, tasks in self._shards:
+            with lock:
+                task_ids.extend(tasks.keys())
+        return task_ids
     
     async def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
         """
         Shutdown the thread pool.
         
+        Tasks that have not started yet are cancelled; only tasks that are
+        already running are waited for.
+        
         Args:
-            wait: Whether to wait for active tasks to complete
+            wait: Whether to wait for running tasks to complete
             timeout: Maximum time to wait for shutdown
         """
         self._shutdown = True
@@ -288,19 +711,33 @@ class ThreadPoolManager:
         
         logger.info("Shutting down thread pool...")
         
-        if wait:
-            # Wait for active tasks to complete
-            try:
-                await self.wait_for_all(timeout=timeout)
-            except TimeoutError:
+        # Cancel queued tasks in one pass, keeping only those already running
+        in_flight = [
+            future for future in self._all_futures()
+            if not future.cancel() and not future.done()
+        ]
+        
+        if wait and in_flight:
+            loop = self._get_loop()
+            waiters = [asyncio.wrap_future(future, loop=loop) for future in in_flight]
+            done, pending = await asyncio.wait(waiters, timeout=timeout)
+            
+            for waiter in done:
+                self._consume_result(waiter)
+            for waiter in pending:
+                waiter.add_done_callback(self._consume_result)
+            
+            if pending:
                 logger.warning("Some tasks did not complete before shutdown timeout")
         
-        # Shutdown the executor
-        self._executor.shutdown(wait=wait)
+        # Workers exit on their own once their current task is done
+        self._executor.shutdown(wait=False)
         self._executor = None
+        self._wake.set()
         
-        with self._lock:
-            self._active_tasks.clear()
+        for lock, tasks in self._shards:
+            with lock:
+                tasks.clear()
         
         logger.info("Thread pool shut down")
     
@@ -309,8 +746,10 @@ class ThreadPoolManager:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         # Note: This is synchronous, so we can't use await
+        self._shutdown = True
         if self._executor:
             self._executor.shutdown(wait=True)
+        self._wake.set()
 
 
 class AdaptiveThreadPoolManager(ThreadPoolManager):
@@ -331,9 +770,15 @@ class AdaptiveThreadPoolManager(ThreadPoolManager):
         self.max_workers_limit = max_workers
         self.scale_up_threshold = scale_up_threshold
         self.scale_down_threshold = scale_down_threshold
-        self._last_scale_time = datetime.now()
+        self._last_scale_time = time.monotonic()
         self._scale_cooldown = 30  # seconds
         
+        # Smoothed load, updated on every scaling check so a single
+        # sample around a threshold does not trigger a resize
+        self._ewma_alpha = 0.3
+        self._queued_ewma = 0.0
+        self._active_ewma = 0.0
+        
         super().__init__(initial_workers, thread_name_prefix)
         
         # Start adaptive scaling task
@@ -371,32 +816,40 @@ class AdaptiveThreadPoolManager(ThreadPoolManager):
     
     async def _check_and_scale(self) -> None:
         """Check if scaling is needed and perform it"""
-        now = datetime.now()
-        time_since_last_scale = (now - self._last_scale_time).total_seconds()
+        active_workers, queued_tasks, _, _ = self.get_counts()
+        
+        # Update the smoothed load before the cooldown check so it keeps
+        # tracking the workload between resizes
+        alpha = self._ewma_alpha
+        self._queued_ewma = alpha * queued_tasks + (1 - alpha) * self._queued_ewma
+        self._active_ewma = alpha * active_workers + (1 - alpha) * self._active_ewma
+        
+        # Monotonic time is immune to wall clock jumps
+        now = time.monotonic()
+        time_since_last_scale = now - self._last_scale_time
         
         # Don't scale too frequently
         if time_since_last_scale < self._scale_cooldown:
             return
         
-        stats = self.get_stats()
-        
         # Scale up if queue is building up
-        if (stats.queued_tasks >= self.scale_up_threshold and 
-            stats.max_workers < self.max_workers_limit):
+        if (self._queued_ewma >= self.scale_up_threshold and 
+            self.max_workers < self.max_workers_limit):
             
-            new_workers = min(stats.max_workers + 1, self.max_workers_limit)
+            new_workers = min(self.max_workers + 1, self.max_workers_limit)
             self.resize_pool(new_workers)
             self._last_scale_time = now
-            logger.info(f"Scaled up to {new_workers} workers (queue: {stats.queued_tasks})")
+            logger.info(f"Scaled up to {new_workers} workers (queue: {self._queued_ewma:.1f})")
         
-        # Scale down if utilization is low
-        elif (stats.active_workers <= self.scale_down_threshold and 
-              stats.max_workers > self.min_workers):
+        # Scale down if utilization is low and no backlog remains
+        elif (self._active_ewma <= self.scale_down_threshold and 
+              self._queued_ewma < 1 and
+              self.max_workers > self.min_workers):
             
-            new_workers = max(stats.max_workers - 1, self.min_workers)
+            new_workers = max(self.max_workers - 1, self.min_workers)
             self.resize_pool(new_workers)
             self._last_scale_time = now
-            logger.info(f"Scaled down to {new_workers} workers (active: {stats.active_workers})")
+            logger.info(f"Scaled down to {new_workers} workers (active: {self._active_ewma:.1f})")
     
     async def shutdown(self, wait: bool = True, timeout: Optional[float] = None) -> None:
         """Shutdown with adaptive scaling cleanup"""
@@ -2,10 +2,15 @@
 yt-dlp based downloader implementation.
 """
 import asyncio
+import functools
 import os
+import re
 import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, Tuple
 import logging
 
 try:
@@ -18,6 +23,39 @@ from app.data.models.core import VideoMetadata, DownloadOptions, DownloadResult,
 
 logger = logging.getLogger(__name__)
 
+# Minimum interval between progress updates while downloading (seconds)
+_PROGRESS_INTERVAL = 0.05
+
+# Maximum number of distinct option sets with cached yt-dlp options
+_YDL_OPTS_CACHE_SIZE = 32
+
+# Platforms recognized from the extractor name or the page URL
+_PLATFORM_MAP = {
+    'youtube': Platform.YOUTUBE,
+    'bilibili': Platform.BILIBILI,
+    'tiktok': Platform.TIKTOK,
+    'instagram': Platform.INSTAGRAM,
+    'pornhub': Platform.PORNHUB,
+}
+_PLATFORM_EXTRACTOR_RE = re.compile('(' + '|'.join(_PLATFORM_MAP) + ')')
+_PLATFORM_URL_RE = re.compile(r'(' + '|'.join(_PLATFORM_MAP) + r')\.com')
+
+
+@functools.lru_cache(maxsize=64)
+def _format_selector(audio_only: bool, quality: str, format_pref: str) -> str:
+    """Build the yt-dlp format selector string for the given preferences"""
+    if audio_only:
+        return 'bestaudio/best'
+    
+    if quality == 'best':
+        return f'best[ext={format_pref}]/best'
+    elif quality == 'worst':
+        return f'worst[ext={format_pref}]/worst'
+    else:
+        # Specific quality (e.g., "720p", "1080p")
+        height = quality.replace('p', '') if 'p' in quality else quality
+        return f'best[height<={height}][ext={format_pref}]/best[height<={height}]/best'
+
 
 class YtDlpDownloader(BaseDownloader):
     """
@@ -33,6 +71,58 @@ class YtDlpDownloader(BaseDownloader):
         self._ydl = None
         self._current_task = None
         self._cancelled = False
+        # Per-download progress state; each download runs on its own
+        # executor thread, so concurrent downloads don't share it
+        self._progress_local = threading.local()
+        
+        # yt-dlp options keyed by option signature, so repeated downloads
+        # with the same options skip rebuilding them. YoutubeDL instances
+        # themselves carry per-download state (download count, return code,
+        # cookies saved on exit) and are created fresh for each download.
+        self._ydl_opts_cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self._ydl_opts_lock = threading.Lock()
+    
+    @staticmethod
+    def _options_key(options: DownloadOptions) -> Tuple:
+        """Build a hashable signature of the options used by _create_ydl_opts"""
+        return (
+            options.output_path,
+            options.filename_template,
+            options.audio_only,
+            options.quality_preference,
+            options.format_preference,
+            tuple(options.subtitle_languages or ()),
+            options.proxy_url,
+            options.cookies_file,
+            options.user_agent,
+            options.speed_limit,
+            options.enable_resume,
+            options.overwrite_existing,
+        )
+    
+    def _get_ydl_opts(self, options: DownloadOptions) -> Dict[str, Any]:
+        """Get the yt-dlp options for a download, built once per option signature"""
+        key = self._options_key(options)
+        with self._ydl_opts_lock:
+            ydl_opts = self._ydl_opts_cache.get(key)
+            if ydl_opts is not None:
+                self._ydl_opts_cache.move_to_end(key)
+        
+        if ydl_opts is None:
+            ydl_opts = self._create_ydl_opts(options)
+            ydl_opts['progress_hooks'] = [self._progress_hook]
+            with self._ydl_opts_lock:
+                self._ydl_opts_cache[key] = ydl_opts
+                while len(self._ydl_opts_cache) > _YDL_OPTS_CACHE_SIZE:
+                    self._ydl_opts_cache.popitem(last=False)
+        
+        # YoutubeDL may adjust its params, keep the cached dict pristine
+        return dict(ydl_opts)
+    
+    def close(self) -> None:
+        """Drop the cached yt-dlp options"""
+        with self._ydl_opts_lock:
+            self._ydl_opts_cache.clear()
     
     def _create_ydl_opts(self, options: DownloadOptions) -> Dict[str, Any]:
         """Create yt-dlp options from DownloadOptions"""
@@ -103,20 +193,11 @@ class YtDlpDownloader(BaseDownloader):
     
     def _get_format_selector(self, options: DownloadOptions) -> str:
         """Generate format selector string for yt-dlp"""
-        if options.audio_only:
-            return 'bestaudio/best'
-        
-        quality = options.quality_preference or 'best'
-        format_pref = options.format_preference or 'mp4'
-        
-        if quality == 'best':
-            return f'best[ext={format_pref}]/best'
-        elif quality == 'worst':
-            return f'worst[ext={format_pref}]/worst'
-        else:
-            # Specific quality (e.g., "720p", "1080p")
-            height = quality.replace('p', '') if 'p' in quality else quality
-            return f'best[height<={height}][ext={format_pref}]/best[height<={height}]/best'
+        return _format_selector(
+            options.audio_only,
+            options.quality_preference or 'best',
+            options.format_preference or 'mp4'
+        )
     
     def _progress_hook(self, d: Dict[str, Any]):
         """Progress hook for yt-dlp"""
@@ -125,22 +206,33 @@ class YtDlpDownloader(BaseDownloader):
         
         status = d.get('status')
         if status == 'downloading':
-            self._update_status(DownloadStatus.DOWNLOADING)
-            
             downloaded = d.get('downloaded_bytes', 0)
             total = d.get('total_bytes') or d.get('total_bytes_estimate', 0)
+            
+            # yt-dlp calls the hook for every chunk, throttle the updates
+            now = time.monotonic()
+            local = self._progress_local
+            if now - getattr(local, 'last_time', 0.0) < _PROGRESS_INTERVAL and downloaded != total:
+                return
+            local.last_time = now
+            
+            self._update_status(DownloadStatus.DOWNLOADING)
+            
             speed = d.get('speed', 0) or 0
             eta = d.get('eta')
             
             percentage = (downloaded / total * 100) if total > 0 else 0
             
-            progress = ProgressInfo(
-                downloaded_bytes=downloaded,
-                total_bytes=total,
-                speed=speed,
-                eta=eta,
-                percentage=percentage
-            )
+            # Reuse one ProgressInfo per worker thread instead of allocating
+            # on every update; consumers that keep it must take a copy
+            progress = getattr(local, 'scratch', None)
+            if progress is None:
+                progress = local.scratch = ProgressInfo()
+            progress.downloaded_bytes = downloaded
+            progress.total_bytes = total
+            progress.speed = speed
+            progress.eta = eta
+            progress.percentage = percentage
             
             self._update_progress(progress)
             
@@ -164,20 +256,16 @@ class YtDlpDownloader(BaseDownloader):
             self._cancelled = False
             self._update_status(DownloadStatus.DOWNLOADING)
             
-            # Create yt-dlp options
-            ydl_opts = self._create_ydl_opts(options)
-            ydl_opts['progress_hooks'] = [self._progress_hook]
-            
             # Ensure output directory exists
             Path(options.output_path).mkdir(parents=True, exist_ok=True)
             
             # Run download in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             result = await loop.run_in_executor(
                 None, 
                 self._download_sync, 
                 url, 
-                ydl_opts
+                options
             )
             
             return result
@@ -190,8 +278,11 @@ class YtDlpDownloader(BaseDownloader):
                 error_message=str(e)
             )
     
-    def _download_sync(self, url: str, ydl_opts: Dict[str, Any]) -> DownloadResult:
+    def _download_sync(self, url: str, options: DownloadOptions) -> DownloadResult:
         """Synchronous download method"""
+        ydl_opts = self._get_ydl_opts(options)
+        # Executor threads are reused; don't throttle this download's first update
+        self._progress_local.last_time = 0.0
         try:
             with yt_dlp.YoutubeDL(ydl_opts) as ydl:
                 self._ydl = ydl
@@ -204,18 +295,19 @@ class YtDlpDownloader(BaseDownloader):
                 # Download the video
                 ydl.download([url])
                 
-                # Get file info
+                # Get file info with a single stat call
                 filename = ydl.prepare_filename(info)
-                file_path = Path(filename)
-                
-                file_size = file_path.stat().st_size if file_path.exists() else 0
+                try:
+                    file_size = os.stat(filename).st_size
+                except OSError:
+                    file_size = 0
                 
                 # Create metadata
                 metadata = self._create_metadata_from_info(info)
                 
                 return DownloadResult(
                     success=True,
-                    file_path=str(file_path),
+                    file_path=os.fspath(filename),
                     file_size=file_size,
                     metadata=metadata
                 )
@@ -238,7 +330,7 @@ class YtDlpDownloader(BaseDownloader):
                 'extract_flat': False,
             }
             
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             info = await loop.run_in_executor(
                 None,
                 self._extract_info_sync,
@@ -303,53 +395,33 @@ class YtDlpDownloader(BaseDownloader):
     def _extract_quality_options(self, info: Dict[str, Any]) -> list[QualityOption]:
         """Extract quality options from yt-dlp info"""
         quality_options = []
-        formats = info.get('formats', [])
-        
-        for fmt in formats:
+        for fmt in info.get('formats', []):
             if not fmt.get('url'):
                 continue
-                
-            quality_id = fmt.get('format_id', '')
-            resolution = f"{fmt.get('width', 0)}x{fmt.get('height', 0)}"
-            format_name = fmt.get('ext', 'unknown')
-            file_size = fmt.get('filesize') or fmt.get('filesize_approx')
+            
+            # Each field is read once; QualityOption is built positionally
             bitrate = fmt.get('tbr')  # total bitrate
             fps = fmt.get('fps')
             codec = fmt.get('vcodec')
-            is_audio_only = fmt.get('vcodec') == 'none'
-            
-            quality_option = QualityOption(
-                quality_id=quality_id,
-                resolution=resolution,
-                format_name=format_name,
-                file_size=file_size,
-                bitrate=int(bitrate) if bitrate else None,
-                fps=int(fps) if fps else None,
-                codec=codec,
-                is_audio_only=is_audio_only
-            )
-            
-            quality_options.append(quality_option)
+            quality_options.append(QualityOption(
+                fmt.get('format_id', ''),
+                f"{fmt.get('width', 0)}x{fmt.get('height', 0)}",
+                fmt.get('ext', 'unknown'),
+                fmt.get('filesize') or fmt.get('filesize_approx'),
+                int(bitrate) if bitrate else None,
+                int(fps) if fps else None,
+                codec,
+                codec == 'none'
+            ))
         
         return quality_options
     
     def _determine_platform(self, info: Dict[str, Any]) -> Platform:
         """Determine platform from yt-dlp info"""
-        extractor = info.get('extractor', '').lower()
-        webpage_url = info.get('webpage_url', '').lower()
-        
-        if 'youtube' in extractor or 'youtube.com' in webpage_url:
-            return Platform.YOUTUBE
-        elif 'bilibili' in extractor or 'bilibili.com' in webpage_url:
-            return Platform.BILIBILI
-        elif 'tiktok' in extractor or 'tiktok.com' in webpage_url:
-            return Platform.TIKTOK
-        elif 'instagram' in extractor or 'instagram.com' in webpage_url:
-            return Platform.INSTAGRAM
-        elif 'pornhub' in extractor or 'pornhub.com' in webpage_url:
-            return Platform.PORNHUB
-        else:
-            return Platform.UNKNOWN
+        # The extractor name is authoritative, the page URL is the fallback
+        match = (_PLATFORM_EXTRACTOR_RE.search(info.get('extractor', '').lower()) or
+                 _PLATFORM_URL_RE.search(info.get('webpage_url', '').lower()))
+        return _PLATFORM_MAP[match.group(1)] if match else Platform.UNKNOWN
     
     async def pause(self) -> None:
         """Pause download (not directly supported by yt-dlp)"""
@@ -1,16 +1,30 @@
 """
 Base extractor abstract class defining the interface for platform-specific extractors.
 """
+import functools
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, ClassVar, Sequence, Tuple
 from dataclasses import dataclass
+from urllib.parse import urlparse
 
 from app.data.models.core import VideoMetadata, QualityOption
 
 
-@dataclass
+@functools.lru_cache(maxsize=4096)
+def _extract_domain_cached(url: str) -> str:
+    """Extract the lower-case domain of a URL (memoized across extractors)"""
+    return urlparse(url).netloc.lower()
+
+
+@functools.lru_cache(maxsize=4096)
+def _extract_host_cached(url: str) -> str:
+    """Extract the lower-case host name of a URL, without port or credentials"""
+    return urlparse(url).hostname or ''
+
+
+@dataclass(frozen=True)
 class ExtractorInfo:
-    """Information about an extractor"""
+    """Information about an extractor (immutable, shared by all instances of a class)"""
     name: str
     version: str
     supported_domains: List[str]
@@ -24,32 +38,65 @@ class BaseExtractor(ABC):
     Each platform plugin must inherit from this class and implement the required methods.
     """
     
+    # Domains this extractor can handle, resolved once at class creation
+    # (e.g. ('youtube.com', 'youtu.be')). Subclasses may instead override
+    # the supported_domains property.
+    SUPPORTED_DOMAINS: ClassVar[Tuple[str, ...]] = ()
+    
+    # Whether one instance can be shared across calls; extractors that keep
+    # per-request state should set this to False
+    is_stateless: ClassVar[bool] = True
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        
+        # Normalize list/set declarations to an immutable tuple
+        domains = cls.__dict__.get('SUPPORTED_DOMAINS')
+        if domains is not None and not isinstance(domains, tuple):
+            cls.SUPPORTED_DOMAINS = tuple(domains)
+    
     def __init__(self):
-        self._info = self.get_extractor_info()
+        # Build the info once per extractor class and share it across instances
+        cls = type(self)
+        info = cls.__dict__.get('_info_cache')
+        if info is None:
+            info = self.get_extractor_info()
+            cls._info_cache = info
+        self._info = info
+        
+        # Exact domains and '.domain' suffixes for subdomain matching
+        domains = [d.lower().strip('.') for d in self.supported_domains]
+        self._exact_domains = frozenset(domains)
+        self._domain_suffixes = tuple('.' + d for d in domains)
     
     @property
-    @abstractmethod
-    def supported_domains(self) -> List[str]:
+    def supported_domains(self) -> Sequence[str]:
         """
-        Return list of domains this extractor can handle.
+        Return the domains this extractor can handle.
+        
+        Defaults to the class-level SUPPORTED_DOMAINS.
         
         Returns:
-            List of domain names (e.g., ['youtube.com', 'youtu.be'])
+            Sequence of domain names (e.g., ('youtube.com', 'youtu.be'))
         """
-        pass
+        return self.SUPPORTED_DOMAINS
     
-    @abstractmethod
     def can_handle(self, url: str) -> bool:
         """
         Check if this extractor can handle the given URL.
         
+        The default accepts any URL on a supported domain using the
+        precomputed domain set/suffixes. Override it to add URL-specific
+        checks (e.g. requiring a video ID). The registry reuses one instance
+        for all checks, so overrides must not modify instance state.
+        
         Args:
             url: The URL to check
             
         Returns:
             True if this extractor can handle the URL, False otherwise
         """
-        pass
+        return self._is_supported_domain(url)
     
     @abstractmethod
     async def extract_info(self, url: str) -> Dict[str, Any]:
@@ -137,13 +184,11 @@ class BaseExtractor(ABC):
         Returns:
             Domain name
         """
-        from urllib.parse import urlparse
-        parsed = urlparse(url)
-        return parsed.netloc.lower()
+        return _extract_domain_cached(url)
     
     def _is_supported_domain(self, url: str) -> bool:
         """
-        Check if the URL's domain is in the supported domains list.
+        Check if the URL's domain is a supported domain or a subdomain of one.
         
         Args:
             url: The URL to check
@@ -151,8 +196,8 @@ class BaseExtractor(ABC):
         Returns:
             True if domain is supported, False otherwise
         """
-        domain = self._extract_domain(url)
-        return any(supported in domain for supported in self.supported_domains)
+        host = _extract_host_cached(url)
+        return host in self._exact_domains or host.endswith(self._domain_suffixes)
     
     @property
     def info(self) -> ExtractorInfo:
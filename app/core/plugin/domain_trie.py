@@ -0,0 +1,140 @@
+"""
+Reverse-domain trie for mapping host names to plugins.
+"""
+import sys
+from typing import Dict, Iterable, List, Optional, Set
+
+
+class _TrieNode:
+    """Single label node of the domain trie"""
+    
+    __slots__ = ('children', 'names')
+    
+    def __init__(self):
+        self.children: Dict[str, '_TrieNode'] = {}
+        self.names: Set[str] = set()
+
+
+class DomainTrie:
+    """
+    Trie keyed by reversed domain labels ('www.youtube.com' is stored as
+    com -> youtube -> www).
+    
+    A registered domain matches itself and all of its subdomains, so a
+    lookup costs one dict access per label of the host regardless of how
+    many domains are registered.
+    """
+    
+    def __init__(self):
+        self._root = _TrieNode()
+        self._size = 0
+    
+    @staticmethod
+    def _labels(domain: str) -> List[str]:
+        """Split a domain into reversed, lower-case labels"""
+        return domain.lower().strip('.').split('.')[::-1]
+    
+    def insert(self, domain: str, name: str) -> bool:
+        """
+        Register a name for a domain.
+        
+        Args:
+            domain: Domain name (e.g. 'youtube.com')
+            name: Name to associate with the domain
+        
+        Returns:
+            True if the name was not yet registered for the domain
+        """
+        node = self._root
+        for label in self._labels(domain):
+            child = node.children.get(label)
+            if child is None:
+                # Labels such as 'www' repeat under many domains
+                child = node.children[sys.intern(label)] = _TrieNode()
+            node = child
+        
+        if name in node.names:
+            return False
+        node.names.add(name)
+        self._size += 1
+        return True
+    
+    def insert_all(self, domains: Iterable[str], name: str) -> None:
+        """Register a name for several domains"""
+        for domain in domains:
+            self.insert(domain, name)
+    
+    def remove(self, domain: str, name: str) -> bool:
+        """
+        Remove a name from a domain, pruning empty branches.
+        
+        Args:
+            domain: Domain name
+            name: Name to remove
+        
+        Returns:
+            True if the name was registered for the domain
+        """
+        path = [self._root]
+        for label in self._labels(domain):
+            child = path[-1].children.get(label)
+            if child is None:
+                return False
+            path.append(child)
+        
+        node = path[-1]
+        if name not in node.names:
+            return False
+        node.names.discard(name)
+        self._size -= 1
+        
+        # Drop nodes that no longer lead to any registered domain
+        labels = self._labels(domain)
+        for depth in range(len(labels), 0, -1):
+            node = path[depth]
+            if node.names or node.children:
+                break
+            del path[depth - 1].children[labels[depth - 1]]
+        return True
+    
+    def remove_all(self, domains: Iterable[str], name: str) -> None:
+        """Remove a name from several domains"""
+        for domain in domains:
+            self.remove(domain, name)
+    
+    def match(self, host: str) -> List[str]:
+        """
+        Find names registered for a host or any of its parent domains.
+        
+        Args:
+            host: Host name to look up (e.g. 'm.youtube.com')
+        
+        Returns:
+            Matching names, most specific domain first
+        """
+        matches = []
+        node = self._root
+        for label in self._labels(host):
+            node = node.children.get(label)
+            if node is None:
+                break
+            if node.names:
+                matches.append(node.names)
+        
+        result = []
+        for names in reversed(matches):
+            result.extend(sorted(names))
+        return result
+    
+    def match_first(self, host: str) -> Optional[str]:
+        """Get the name registered for the most specific matching domain"""
+        matches = self.match(host)
+        return matches[0] if matches else None
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def clear(self) -> None:
+        """Remove all entries"""
+        self._root = _TrieNode()
+        self._size = 0
@@ -1,21 +1,62 @@
 """
 Plugin loader for dynamically loading and managing extractor plugins.
 """
+import ast
+import heapq
 import os
 import sys
 import importlib
 import importlib.util
 from pathlib import Path
-from typing import Dict, List, Type, Optional, Set
+from typing import Callable, Dict, List, NamedTuple, Type, Optional, Set, Tuple
 import logging
 from dataclasses import dataclass
 import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+try:
+    import watchfiles
+except ImportError:
+    watchfiles = None
+
 from app.core.extractor.base import BaseExtractor, ExtractorInfo
 
+# Modules and builtins that are reported by the plugin security check
+FORBIDDEN_MODULES = frozenset({'os', 'subprocess', 'sys'})
+FORBIDDEN_CALLS = frozenset({'exec', 'eval', '__import__', 'open', 'file'})
+
+# Scheduler key of the batched plugin refresh tick
+_REFRESH_TICK = '<refresh>'
+
+# Plugin directories already created/initialized by this process
+_ensured_plugin_dirs: Set[Path] = set()
+
+# File systems on which native change notifications are unreliable
+NETWORK_FILESYSTEMS = frozenset({'nfs', 'nfs4', 'cifs', 'smbfs', 'smb3'})
+
+
+def _is_network_mount(path: Path) -> bool:
+    """Check whether path lives on a network file system (Linux only)"""
+    try:
+        with open('/proc/mounts', encoding='utf-8') as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return False
+    
+    # The longest mount point containing the path determines its file system
+    best_point, best_type = '', ''
+    path_str = str(path)
+    for mount_point, fs_type in entries:
+        mount_point = mount_point.replace('\\040', ' ')
+        if ((path_str == mount_point or path_str.startswith(mount_point.rstrip('/') + '/')) and
+                len(mount_point) > len(best_point)):
+            best_point, best_type = mount_point, fs_type
+    return best_type in NETWORK_FILESYSTEMS
+
 
 @dataclass
 class PluginLoadResult:
@@ -26,57 +67,77 @@ class PluginLoadResult:
     error_message: Optional[str] = None
 
 
+class _ChangeEvent(NamedTuple):
+    """Minimal watchdog-style event built from a watchfiles change"""
+    src_path: str
+    is_directory: bool = False
+
+
 class PluginFileWatcher(FileSystemEventHandler):
-    """File system watcher for plugin hot reloading"""
+    """
+    File system watcher for plugin hot reloading.
+    
+    Events only mark plugins dirty on the loader. A single debounced tick
+    then refreshes all dirty plugins in one pass, so a burst of events
+    (editor save, git checkout) results in one reload per plugin.
+    """
+    
+    # Quiet period after the last event before a plugin is (re)loaded
+    DEBOUNCE_DELAY = 0.5  # seconds
     
     def __init__(self, loader: 'PluginLoader'):
         self.loader = loader
         self.logger = logging.getLogger(__name__)
     
+    def _plugin_name(self, event) -> Optional[str]:
+        """Get the plugin name for an event, or None if it should be ignored"""
+        # Known plugin files resolve with a single lookup
+        plugin_name = self.loader._path_to_name.get(event.src_path)
+        if plugin_name:
+            return plugin_name
+        
+        src_path = event.src_path
+        if (event.is_directory or not src_path.endswith('.py') or
+                os.path.dirname(src_path) not in self.loader._watched_dirs):
+            return None
+        
+        plugin_name = Path(src_path).stem
+        # Skip package markers and hidden editor files such as '.#plugin.py'
+        if plugin_name == '__init__' or plugin_name.startswith('.'):
+            return None
+        return plugin_name
+    
     def on_modified(self, event):
         if event.is_directory:
+            # A directory change without matching file events means events
+            # may have been dropped; the tick rescans if nothing is dirty
+            if event.src_path in self.loader._watched_dirs:
+                self.loader.mark_dirty(None, self.DEBOUNCE_DELAY)
             return
         
-        if event.src_path.endswith('.py'):
-            plugin_name = Path(event.src_path).stem
-            if plugin_name != '__init__':
-                self.logger.info(f"Plugin file modified: {plugin_name}")
-                # Reload the plugin after a short delay to ensure file is fully written
-                threading.Timer(1.0, self._reload_plugin, args=[plugin_name]).start()
+        plugin_name = self._plugin_name(event)
+        if plugin_name:
+            self.logger.info(f"Plugin file modified: {plugin_name}")
+            self.loader.invalidate_load_cache(plugin_name)
+            # Reload the plugin once the directory has stopped changing
+            self.loader.mark_dirty(plugin_name, self.DEBOUNCE_DELAY)
     
     def on_created(self, event):
-        if event.is_directory:
-            return
-        
-        if event.src_path.endswith('.py'):
-            plugin_name = Path(event.src_path).stem
-            if plugin_name != '__init__':
-                self.logger.info(f"New plugin file created: {plugin_name}")
-                threading.Timer(1.0, self._load_plugin, args=[plugin_name]).start()
+        plugin_name = self._plugin_name(event)
+        if plugin_name:
+            self.logger.info(f"New plugin file created: {plugin_name}")
+            self.loader.mark_dirty(plugin_name, self.DEBOUNCE_DELAY)
     
     def on_deleted(self, event):
-        if event.is_directory:
-            return
-        
-        if event.src_path.endswith('.py'):
-            plugin_name = Path(event.src_path).stem
-            if plugin_name != '__init__':
-                self.logger.info(f"Plugin file deleted: {plugin_name}")
-                self.loader.unload_plugin(plugin_name)
-    
-    def _reload_plugin(self, plugin_name: str):
-        """Reload a plugin"""
-        try:
-            self.loader.reload_plugin(plugin_name)
-        except Exception as e:
-            self.logger.error(f"Failed to reload plugin {plugin_name}: {e}")
+        plugin_name = self._plugin_name(event)
+        if plugin_name:
+            self.logger.info(f"Plugin file deleted: {plugin_name}")
+            self.cancel_pending(plugin_name)
+            self.loader.unload_plugin(plugin_name)
     
-    def _load_plugin(self, plugin_name: str):
-        """Load a new plugin"""
-        try:
-            self.loader.load_plugin(plugin_name)
-        except Exception as e:
-            self.logger.error(f"Failed to load new plugin {plugin_name}: {e}")
+    def cancel_pending(self, plugin_name: Optional[str] = None):
+        """Cancel pending refreshes for a plugin, or for all plugins if no name is given"""
+        self.loader.cancel_dirty(plugin_name)
 
 
 class PluginLoader:
@@ -85,7 +146,18 @@ class PluginLoader:
     Supports loading, unloading, and hot reloading of plugins.
     """
     
-    def __init__(self, plugin_directories: List[str] = None):
+    def __init__(self, plugin_directories: List[str] = None,
+                 observer_cls: Optional[Type] = None, poll_interval: float = 30.0):
+        """
+        Initialize plugin loader.
+        
+        Args:
+            plugin_directories: Directories to load plugins from
+            observer_cls: Watchdog observer class used for hot reloading. If None,
+                watchfiles is used when installed, otherwise a watchdog observer
+                is auto-selected per file system
+            poll_interval: Polling interval in seconds when a polling observer is used
+        """
         self.logger = logging.getLogger(__name__)
         
         # Default plugin directories
@@ -99,7 +171,9 @@ class PluginLoader:
         
         # Loaded plugins
         self.loaded_plugins: Dict[str, Type[BaseExtractor]] = {}
-        self.plugin_modules: Dict[str, object] = {}
+        # Modules are kept alive by their extractor class (see _load_plugin),
+        # so they can be collected once an unloaded class is no longer in use
+        self.plugin_modules: 'weakref.WeakValueDictionary[str, object]' = weakref.WeakValueDictionary()
         self.plugin_info: Dict[str, ExtractorInfo] = {}
         
         # Security settings
@@ -109,13 +183,42 @@ class PluginLoader:
             'dataclasses', 'abc', 'asyncio', 'aiohttp'
         }
         
+        # Plugin file paths (as reported by the file watcher) to plugin names
+        self._path_to_name: Dict[str, str] = {}
+        
+        # Parsed plugin sources keyed by file, validated against (mtime_ns, size)
+        self._ast_cache: Dict[Path, Tuple[int, int, ast.AST]] = {}
+        
+        # Loaded plugins keyed by name, valid while (file, mtime_ns, size) is unchanged
+        self._load_cache: Dict[str, Tuple[Path, int, int, Type[BaseExtractor], Optional[ExtractorInfo]]] = {}
+        
         # File watcher for hot reloading
         self.observer: Optional[Observer] = None
+        self.observer_cls = observer_cls
+        self.poll_interval = poll_interval
         self.file_watcher: Optional[PluginFileWatcher] = None
+        self._watch_thread: Optional[threading.Thread] = None
+        self._watch_stop: Optional[threading.Event] = None
+        self._watched_dirs: frozenset = frozenset()
         self.hot_reload_enabled = False
         
-        # Thread safety
-        self._lock = threading.RLock()
+        # Deferred per-plugin actions run by a single scheduler thread:
+        # a heap of (run_at, plugin_name) plus the live entry per plugin.
+        # Heap entries whose run_at no longer matches the live entry are stale.
+        self._schedule_cond = threading.Condition()
+        self._schedule_heap: List[Tuple[float, str]] = []
+        self._scheduled: Dict[str, Tuple[float, Callable[[str], None]]] = {}
+        self._scheduler_thread: Optional[threading.Thread] = None
+        
+        # Plugins waiting for the next refresh tick, and the last seen
+        # mtime_ns of every plugin file for rescans after dropped events
+        self._dirty: Set[str] = set()
+        self._known_mtimes: Dict[str, int] = {}
+        
+        # Thread safety: per-plugin locks serialize loads of the same plugin,
+        # the registry lock is only held briefly to update the shared dicts
+        self._registry_lock = threading.Lock()
+        self._plugin_locks: Dict[str, threading.RLock] = {}
         
         # Ensure plugin directories exist
         self._ensure_plugin_directories()
@@ -123,12 +226,22 @@ class PluginLoader:
     def _ensure_plugin_directories(self):
         """Ensure plugin directories exist"""
         for plugin_dir in self.plugin_directories:
+            if plugin_dir in _ensured_plugin_dirs:
+                continue
+            
             plugin_dir.mkdir(parents=True, exist_ok=True)
             
-            # Create __init__.py if it doesn't exist
+            # Create __init__.py atomically unless it already exists
             init_file = plugin_dir / '__init__.py'
-            if not init_file.exists():
-                init_file.write_text('# Plugin directory\n')
+            try:
+                fd = os.open(init_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                pass
+            else:
+                with os.fdopen(fd, 'w') as f:
+                    f.write('# Plugin directory\n')
+            
+            _ensured_plugin_dirs.add(plugin_dir)
     
     def enable_hot_reload(self):
         """Enable hot reloading of plugins"""
@@ -136,30 +249,271 @@ class PluginLoader:
             return
         
         self.file_watcher = PluginFileWatcher(self)
-        self.observer = Observer()
         
+        # Watch each existing directory once, even if it is configured twice
+        # or reached through different symlinks. Watches are non-recursive,
+        # so nested plugin directories still need their own watch.
+        watched_dirs = []
         for plugin_dir in self.plugin_directories:
             if plugin_dir.exists():
-                self.observer.schedule(self.file_watcher, str(plugin_dir), recursive=False)
+                real_dir = str(plugin_dir.resolve())
+                if real_dir not in watched_dirs:
+                    watched_dirs.append(real_dir)
+        self._watched_dirs = frozenset(watched_dirs)
+        
+        if self.observer_cls is None and watchfiles is not None:
+            # Batched, debounced events from a single native watcher thread
+            self._watch_stop = threading.Event()
+            self._watch_thread = threading.Thread(
+                target=self._watchfiles_loop, args=(watched_dirs, self._watch_stop),
+                name='PluginWatcher', daemon=True
+            )
+            self._watch_thread.start()
+        else:
+            self.observer = self._create_observer()
+            for real_dir in watched_dirs:
+                self.observer.schedule(self.file_watcher, real_dir, recursive=False)
+            self.observer.start()
         
-        self.observer.start()
         self.hot_reload_enabled = True
         self.logger.info("Plugin hot reloading enabled")
     
+    def _create_observer(self):
+        """
+        Create the file system observer.
+        
+        Native observers miss or drop events on network mounts, so a
+        PollingObserver is used when any plugin directory is on NFS/SMB.
+        """
+        from watchdog.observers.polling import PollingObserver
+        
+        observer_cls = self.observer_cls
+        if observer_cls is None:
+            if not any(_is_network_mount(d) for d in self.plugin_directories):
+                return Observer()
+            observer_cls = PollingObserver
+        
+        if issubclass(observer_cls, PollingObserver):
+            self.logger.info(f"Using polling plugin observer ({self.poll_interval}s interval)")
+            return observer_cls(timeout=self.poll_interval)
+        return observer_cls()
+    
+    def _watchfiles_loop(self, watched_dirs: List[str], stop_event: threading.Event):
+        """Dispatch watchfiles change batches to the plugin file watcher"""
+        handlers = {
+            watchfiles.Change.added: 'on_created',
+            watchfiles.Change.modified: 'on_modified',
+            watchfiles.Change.deleted: 'on_deleted',
+        }
+        
+        # Same network-mount fallback as for watchdog observers
+        force_polling = any(_is_network_mount(Path(d)) for d in watched_dirs) or None
+        
+        try:
+            for changes in watchfiles.watch(
+                *watched_dirs,
+                watch_filter=watchfiles.PythonFilter(),
+                debounce=1000,
+                step=500,
+                stop_event=stop_event,
+                raise_interrupt=False,
+                recursive=False,
+                force_polling=force_polling,
+                poll_delay_ms=int(self.poll_interval * 1000)
+            ):
+                file_watcher = self.file_watcher
+                if file_watcher is None:
+                    break
+                
+                for change, path in changes:
+                    getattr(file_watcher, handlers[change])(_ChangeEvent(path))
+        except Exception as e:
+            self.logger.error(f"Plugin file watcher stopped: {e}")
+    
     def disable_hot_reload(self):
         """Disable hot reloading of plugins"""
         if not self.hot_reload_enabled:
             return
         
+        if self._watch_thread:
+            self._watch_stop.set()
+            self._watch_thread.join()
+            self._watch_thread = None
+            self._watch_stop = None
+        
         if self.observer:
             self.observer.stop()
             self.observer.join()
             self.observer = None
         
+        if self.file_watcher:
+            self.file_watcher.cancel_pending()
         self.file_watcher = None
         self.hot_reload_enabled = False
         self.logger.info("Plugin hot reloading disabled")
     
+    def schedule(self, plugin_name: str, action: Callable[[str], None], delay: float) -> None:
+        """
+        Run an action for a plugin after a delay on the scheduler thread.
+        
+        Scheduling a plugin that already has a pending action replaces it,
+        which debounces bursts of file system events.
+        
+        Args:
+            plugin_name: Name of the plugin
+            action: Callable invoked with the plugin name
+            delay: Delay in seconds
+        """
+        run_at = time.monotonic() + delay
+        with self._schedule_cond:
+            self._scheduled[plugin_name] = (run_at, action)
+            heapq.heappush(self._schedule_heap, (run_at, plugin_name))
+            
+            # The scheduler thread exits when idle and is restarted on demand
+            if self._scheduler_thread is None:
+                self._scheduler_thread = threading.Thread(
+                    target=self._scheduler_loop, name='PluginScheduler', daemon=True
+                )
+                self._scheduler_thread.start()
+            else:
+                self._schedule_cond.notify()
+    
+    def cancel_scheduled(self, plugin_name: Optional[str] = None) -> None:
+        """
+        Cancel the pending action of a plugin, or of all plugins if no name is given.
+        
+        Args:
+            plugin_name: Name of the plugin
+        """
+        with self._schedule_cond:
+            if plugin_name is None:
+                self._scheduled.clear()
+                self._schedule_heap.clear()
+            else:
+                self._scheduled.pop(plugin_name, None)
+            self._schedule_cond.notify()
+    
+    def mark_dirty(self, plugin_name: Optional[str], delay: float) -> None:
+        """
+        Queue a plugin for the next refresh tick.
+        
+        The tick runs once no plugin has been marked for ``delay`` seconds
+        and refreshes all dirty plugins in one pass. Marking with no name
+        only schedules the tick, which then rescans the plugin directories
+        if nothing else is dirty.
+        
+        Args:
+            plugin_name: Name of the plugin, or None to request a rescan
+            delay: Quiet period in seconds before the tick runs
+        """
+        with self._schedule_cond:
+            if plugin_name is not None:
+                self._dirty.add(plugin_name)
+        self.schedule(_REFRESH_TICK, self._refresh_dirty, delay)
+    
+    def cancel_dirty(self, plugin_name: Optional[str] = None) -> None:
+        """
+        Drop a plugin, or all plugins if no name is given, from the refresh queue.
+        
+        Args:
+            plugin_name: Name of the plugin
+        """
+        with self._schedule_cond:
+            if plugin_name is None:
+                self._dirty.clear()
+            else:
+                self._dirty.discard(plugin_name)
+        
+        if plugin_name is None:
+            self.cancel_scheduled()
+    
+    def _refresh_dirty(self, _tick: str) -> None:
+        """Refresh all dirty plugins in one pass"""
+        with self._schedule_cond:
+            dirty, self._dirty = self._dirty, set()
+        
+        if not dirty:
+            dirty = self._find_changed()
+        
+        for plugin_name in sorted(dirty):
+            try:
+                if not self._locate_plugin_file(plugin_name):
+                    self.unload_plugin(plugin_name)
+                elif plugin_name in self.loaded_plugins:
+                    self.reload_plugin(plugin_name)
+                else:
+                    self.load_plugin(plugin_name)
+            except Exception as e:
+                self.logger.error(f"Failed to refresh plugin {plugin_name}: {e}")
+    
+    def _find_changed(self) -> Set[str]:
+        """Find plugins whose files were added, modified or removed since last seen"""
+        changed = set()
+        seen = set()
+        for plugin_dir in self.plugin_directories:
+            try:
+                entries = os.scandir(plugin_dir)
+            except OSError:
+                continue
+            
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith('.py') or name == '__init__.py' or name.startswith('.'):
+                        continue
+                    
+                    seen.add(entry.path)
+                    try:
+                        mtime_ns = entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    if self._known_mtimes.get(entry.path) != mtime_ns:
+                        changed.add(name[:-3])
+        
+        with self._registry_lock:
+            for path in self._known_mtimes.keys() - seen:
+                changed.add(self._path_to_name.get(path) or Path(path).stem)
+        
+        if changed:
+            self.logger.info(f"Plugin rescan found changes: {sorted(changed)}")
+        return changed
+    
+    def _next_scheduled(self) -> Optional[Tuple[str, Callable[[str], None]]]:
+        """Wait for the next due action (caller holds _schedule_cond); None when idle"""
+        heap = self._schedule_heap
+        while heap:
+            run_at, plugin_name = heap[0]
+            entry = self._scheduled.get(plugin_name)
+            if entry is None or entry[0] != run_at:
+                # Superseded or cancelled
+                heapq.heappop(heap)
+                continue
+            
+            delay = run_at - time.monotonic()
+            if delay > 0:
+                self._schedule_cond.wait(delay)
+                continue
+            
+            heapq.heappop(heap)
+            del self._scheduled[plugin_name]
+            return plugin_name, entry[1]
+        return None
+    
+    def _scheduler_loop(self) -> None:
+        """Run scheduled plugin actions until nothing is pending"""
+        while True:
+            with self._schedule_cond:
+                due = self._next_scheduled()
+                if due is None:
+                    self._scheduler_thread = None
+                    return
+            
+            plugin_name, action = due
+            try:
+                action(plugin_name)
+            except Exception as e:
+                self.logger.error(f"Scheduled action failed for plugin {plugin_name}: {e}")
+    
     def load_all_plugins(self) -> List[PluginLoadResult]:
         """
         Load all plugins from plugin directories.
@@ -167,24 +521,99 @@ class PluginLoader:
         Returns:
             List of PluginLoadResult objects
         """
-        results = []
+        located = self._locate_all_plugins()
         
-        with self._lock:
-            for plugin_dir in self.plugin_directories:
-                if not plugin_dir.exists():
-                    continue
-                
-                for plugin_file in plugin_dir.glob('*.py'):
-                    if plugin_file.name == '__init__.py':
-                        continue
-                    
-                    plugin_name = plugin_file.stem
-                    result = self.load_plugin(plugin_name)
-                    results.append(result)
+        # Plugins are independent, so read/parse/exec them concurrently
+        results = []
+        if located:
+            max_workers = min(32, (os.cpu_count() or 1) * 4, len(located))
+            with ThreadPoolExecutor(max_workers=max_workers,
+                                    thread_name_prefix='PluginLoader') as executor:
+                results = list(executor.map(
+                    lambda item: self._load_plugin(item[0], *item[1]), located.items()
+                ))
         
         self.logger.info(f"Loaded {len([r for r in results if r.success])} plugins successfully")
         return results
     
+    def scan_all_plugins(self) -> Dict[str, Optional[Tuple[str, ...]]]:
+        """
+        Read the supported domains of all plugins without importing them.
+        
+        Domains are taken from a literal SUPPORTED_DOMAINS class attribute
+        or a supported_domains property that returns a literal list.
+        
+        Returns:
+            Dictionary mapping plugin names to their domains, or to None
+            if the domains can only be known by loading the plugin
+        """
+        manifests = {}
+        for plugin_name, (plugin_file, _st) in self._locate_all_plugins().items():
+            try:
+                manifests[plugin_name] = self._static_domains(self._parse_plugin(plugin_file))
+            except (OSError, SyntaxError, ValueError) as e:
+                self.logger.warning(f"Could not scan plugin {plugin_name}: {e}")
+                manifests[plugin_name] = None
+        
+        self.logger.info(f"Scanned {len(manifests)} plugins")
+        return manifests
+    
+    def _locate_all_plugins(self) -> Dict[str, Tuple[Path, os.stat_result]]:
+        """Find all plugin files; earlier directories take precedence like in _find_plugin_file"""
+        located: Dict[str, Tuple[Path, os.stat_result]] = {}
+        for plugin_dir in self.plugin_directories:
+            try:
+                entries = os.scandir(plugin_dir)
+            except OSError:
+                continue
+            
+            with entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.endswith('.py') or name == '__init__.py':
+                        continue
+                    
+                    plugin_name = name[:-3]
+                    if plugin_name not in located and entry.is_file():
+                        located[plugin_name] = (Path(entry.path), entry.stat())
+        return located
+    
+    @staticmethod
+    def _static_domains(tree: ast.AST) -> Optional[Tuple[str, ...]]:
+        """Get the literal domains declared by the extractor class in a plugin AST"""
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            base_names = {b.id if isinstance(b, ast.Name) else getattr(b, 'attr', None)
+                          for b in node.bases}
+            if 'BaseExtractor' not in base_names:
+                continue
+            
+            for item in node.body:
+                value = None
+                if isinstance(item, ast.Assign) and any(
+                        isinstance(t, ast.Name) and t.id == 'SUPPORTED_DOMAINS' for t in item.targets):
+                    value = item.value
+                elif (isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name)
+                        and item.target.id == 'SUPPORTED_DOMAINS'):
+                    value = item.value
+                elif isinstance(item, ast.FunctionDef) and item.name == 'supported_domains':
+                    # Only a bare 'return [...]', optionally after a docstring
+                    body = item.body[1:] if ast.get_docstring(item) is not None else item.body
+                    if len(body) == 1 and isinstance(body[0], ast.Return):
+                        value = body[0].value
+                
+                if value is None:
+                    continue
+                try:
+                    domains = ast.literal_eval(value)
+                except ValueError:
+                    return None
+                if isinstance(domains, (list, tuple)) and all(isinstance(d, str) for d in domains):
+                    return tuple(domains)
+                return None
+        return None
+    
     def load_plugin(self, plugin_name: str) -> PluginLoadResult:
         """
         Load a specific plugin by name.
@@ -195,15 +624,35 @@ class PluginLoader:
         Returns:
             PluginLoadResult object
         """
-        with self._lock:
+        # Find plugin file
+        located = self._locate_plugin_file(plugin_name)
+        if not located:
+            return PluginLoadResult(
+                success=False,
+                plugin_name=plugin_name,
+                error_message=f"Plugin file not found: {plugin_name}"
+            )
+        
+        return self._load_plugin(plugin_name, *located)
+    
+    def _load_plugin(self, plugin_name: str, plugin_file: Path,
+                     st: os.stat_result) -> PluginLoadResult:
+        """Load a plugin from an already located file with its stat result"""
+        with self._plugin_lock(plugin_name):
             try:
-                # Find plugin file
-                plugin_file = self._find_plugin_file(plugin_name)
-                if not plugin_file:
+                # Skip re-executing a plugin that is loaded and unchanged on disk
+                with self._registry_lock:
+                    self._path_to_name[str(plugin_file)] = plugin_name
+                    self._known_mtimes[str(plugin_file)] = st.st_mtime_ns
+                    cached = self._load_cache.get(plugin_name)
+                    unchanged = (cached and
+                                 cached[:3] == (plugin_file, st.st_mtime_ns, st.st_size) and
+                                 self.loaded_plugins.get(plugin_name) is cached[3])
+                if unchanged:
                     return PluginLoadResult(
-                        success=False,
+                        success=True,
                         plugin_name=plugin_name,
-                        error_message=f"Plugin file not found: {plugin_name}"
+                        extractor_class=cached[3]
                     )
                 
                 # Security check
@@ -215,7 +664,7 @@ class PluginLoader:
                     )
                 
                 # Load module
-                module = self._load_module(plugin_name, plugin_file)
+                module, extractor_class = self._load_module(plugin_name, plugin_file)
                 if not module:
                     return PluginLoadResult(
                         success=False,
@@ -223,8 +672,9 @@ class PluginLoader:
                         error_message=f"Failed to load module: {plugin_name}"
                     )
                 
-                # Find extractor class
-                extractor_class = self._find_extractor_class(module)
+                # Fall back to scanning the module, e.g. for indirect subclasses
+                if not extractor_class:
+                    extractor_class = self._find_extractor_class(module)
                 if not extractor_class:
                     return PluginLoadResult(
                         success=False,
@@ -232,24 +682,40 @@ class PluginLoader:
                         error_message=f"No valid extractor class found in plugin: {plugin_name}"
                     )
                 
+                # Instantiate once for validation, info and domains
+                try:
+                    instance = extractor_class()
+                except Exception as e:
+                    self.logger.error(f"Extractor validation failed: {e}")
+                    instance = None
+                
                 # Validate extractor
-                if not self._validate_extractor(extractor_class):
+                if instance is None or not self._validate_instance(instance):
                     return PluginLoadResult(
                         success=False,
                         plugin_name=plugin_name,
                         error_message=f"Extractor validation failed: {plugin_name}"
                     )
                 
+                info = instance.info
+                
+                # Lower-case and intern domains so plugins sharing a domain
+                # share one string object in the index
+                domains = tuple(sys.intern(d.lower()) for d in instance.supported_domains)
+                if type(instance).supported_domains is BaseExtractor.supported_domains:
+                    extractor_class.SUPPORTED_DOMAINS = domains
+                
                 # Store plugin
-                self.loaded_plugins[plugin_name] = extractor_class
-                self.plugin_modules[plugin_name] = module
+                # Tie the module's lifetime to the class rather than the loader
+                extractor_class._plugin_module = module
                 
-                # Get plugin info
-                try:
-                    instance = extractor_class()
-                    self.plugin_info[plugin_name] = instance.info
-                except Exception as e:
-                    self.logger.warning(f"Failed to get plugin info for {plugin_name}: {e}")
+                with self._registry_lock:
+                    self.loaded_plugins[plugin_name] = extractor_class
+                    self.plugin_modules[plugin_name] = module
+                    self.plugin_info[plugin_name] = info
+                    self._load_cache[plugin_name] = (
+                        plugin_file, st.st_mtime_ns, st.st_size, extractor_class, info
+                    )
                 
                 self.logger.info(f"Successfully loaded plugin: {plugin_name}")
                 return PluginLoadResult(
@@ -276,18 +742,26 @@ class PluginLoader:
         Returns:
             True if successful, False otherwise
         """
-        with self._lock:
+        with self._plugin_lock(plugin_name), self._registry_lock:
             try:
+                self._load_cache.pop(plugin_name, None)
+                
+                # Drop cached parse trees of the plugin's files
+                plugin_paths = [path for path, name in self._path_to_name.items() if name == plugin_name]
+                for path in plugin_paths:
+                    self._ast_cache.pop(Path(path), None)
+                    self._known_mtimes.pop(path, None)
+                    del self._path_to_name[path]
+                
+                # Remove from sys.modules if it was added
+                module_name = f"plugins.{plugin_name}"
+                if module_name in sys.modules:
+                    del sys.modules[module_name]
+                self.plugin_modules.pop(plugin_name, None)
+                
                 if plugin_name in self.loaded_plugins:
                     del self.loaded_plugins[plugin_name]
                 
-                if plugin_name in self.plugin_modules:
-                    # Remove from sys.modules if it was added
-                    module_name = f"plugins.{plugin_name}"
-                    if module_name in sys.modules:
-                        del sys.modules[module_name]
-                    del self.plugin_modules[plugin_name]
-                
                 if plugin_name in self.plugin_info:
                     del self.plugin_info[plugin_name]
                 
@@ -302,18 +776,43 @@ class PluginLoader:
         """
         Reload a specific plugin.
         
+        The new version is loaded while the old one stays registered and is
+        swapped in under the registry lock, so lookups never see the plugin
+        missing. Only the per-plugin lock is held while the module executes.
+        
         Args:
             plugin_name: Name of the plugin to reload
             
         Returns:
             PluginLoadResult object
         """
-        with self._lock:
-            # Unload first
-            self.unload_plugin(plugin_name)
+        with self._plugin_lock(plugin_name):
+            # Force re-execution even if the file looks unchanged
+            self.invalidate_load_cache(plugin_name)
             
-            # Then load again
-            return self.load_plugin(plugin_name)
+            result = self.load_plugin(plugin_name)
+            if not result.success:
+                # Do not keep serving the stale version
+                self.unload_plugin(plugin_name)
+            return result
+    
+    def invalidate_load_cache(self, plugin_name: str) -> None:
+        """
+        Forget the cached load result of a plugin so the next load re-executes it.
+        
+        Args:
+            plugin_name: Name of the plugin
+        """
+        with self._registry_lock:
+            self._load_cache.pop(plugin_name, None)
+    
+    def _plugin_lock(self, plugin_name: str) -> threading.RLock:
+        """Get the lock serializing load/unload of a single plugin"""
+        lock = self._plugin_locks.get(plugin_name)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._plugin_locks.setdefault(plugin_name, threading.RLock())
+        return lock
     
     def get_loaded_plugins(self) -> Dict[str, Type[BaseExtractor]]:
         """
@@ -322,7 +821,7 @@ class PluginLoader:
         Returns:
             Dictionary mapping plugin names to extractor classes
         """
-        with self._lock:
+        with self._registry_lock:
             return self.loaded_plugins.copy()
     
     def get_plugin_info(self, plugin_name: str) -> Optional[ExtractorInfo]:
@@ -335,7 +834,7 @@ class PluginLoader:
         Returns:
             ExtractorInfo object or None if plugin not found
         """
-        with self._lock:
+        with self._registry_lock:
             return self.plugin_info.get(plugin_name)
     
     def get_all_plugin_info(self) -> Dict[str, ExtractorInfo]:
@@ -345,15 +844,22 @@ class PluginLoader:
         Returns:
             Dictionary mapping plugin names to ExtractorInfo objects
         """
-        with self._lock:
+        with self._registry_lock:
             return self.plugin_info.copy()
     
     def _find_plugin_file(self, plugin_name: str) -> Optional[Path]:
         """Find plugin file in plugin directories"""
+        located = self._locate_plugin_file(plugin_name)
+        return located[0] if located else None
+    
+    def _locate_plugin_file(self, plugin_name: str) -> Optional[Tuple[Path, os.stat_result]]:
+        """Find plugin file and stat it with a single syscall per directory"""
         for plugin_dir in self.plugin_directories:
             plugin_file = plugin_dir / f"{plugin_name}.py"
-            if plugin_file.exists():
-                return plugin_file
+            try:
+                return plugin_file, plugin_file.stat()
+            except OSError:
+                continue
         return None
     
     def _security_check(self, plugin_file: Path) -> bool:
@@ -367,46 +873,77 @@ class PluginLoader:
             True if security check passes, False otherwise
         """
         try:
-            content = plugin_file.read_text(encoding='utf-8')
+            tree = self._parse_plugin(plugin_file)
             
             # Check for dangerous imports/operations
-            dangerous_patterns = [
-                'import os',
-                'import subprocess',
-                'import sys',
-                'exec(',
-                'eval(',
-                '__import__',
-                'open(',
-                'file(',
-            ]
-            
-            for pattern in dangerous_patterns:
-                if pattern in content:
-                    self.logger.warning(f"Potentially dangerous pattern found in {plugin_file}: {pattern}")
-                    # For now, just warn but don't block - in production this might be stricter
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    modules = [alias.name for alias in node.names]
+                elif isinstance(node, ast.ImportFrom):
+                    modules = [node.module] if node.module and node.level == 0 else []
+                elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and
+                      node.func.id in FORBIDDEN_CALLS):
+                    self.logger.warning(f"Potentially dangerous call found in {plugin_file} "
+                                        f"(line {node.lineno}): {node.func.id}()")
+                    continue
+                else:
+                    continue
+                
+                for module in modules:
+                    if module.partition('.')[0] in FORBIDDEN_MODULES:
+                        self.logger.warning(f"Potentially dangerous import found in {plugin_file} "
+                                            f"(line {node.lineno}): {module}")
             
+            # For now, just warn but don't block - in production this might be stricter
             return True
             
         except Exception as e:
             self.logger.error(f"Security check failed for {plugin_file}: {e}")
             return False
     
-    def _load_module(self, plugin_name: str, plugin_file: Path) -> Optional[object]:
-        """Load Python module from file"""
+    def _parse_plugin(self, plugin_file: Path) -> ast.AST:
+        """Parse a plugin file, reusing the cached tree if the file is unchanged"""
+        st = plugin_file.stat()
+        cached = self._ast_cache.get(plugin_file)
+        if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return cached[2]
+        
+        content = plugin_file.read_bytes()
+        tree = ast.parse(content, filename=str(plugin_file))
+        self._ast_cache[plugin_file] = (st.st_mtime_ns, st.st_size, tree)
+        return tree
+    
+    def _load_module(self, plugin_name: str,
+                     plugin_file: Path) -> Tuple[Optional[object], Optional[Type[BaseExtractor]]]:
+        """
+        Load Python module from file.
+        
+        Returns:
+            Tuple of (module, extractor class defined by the module). The
+            class is found by diffing BaseExtractor's direct subclasses
+            around exec_module, so it is None for indirect subclasses.
+        """
         try:
             spec = importlib.util.spec_from_file_location(plugin_name, plugin_file)
             if not spec or not spec.loader:
-                return None
+                return None, None
             
             module = importlib.util.module_from_spec(spec)
+            before = set(BaseExtractor.__subclasses__())
             spec.loader.exec_module(module)
             
-            return module
+            # Only accept classes defined by this module, not ones created
+            # concurrently by other plugins
+            new_classes = [
+                cls for cls in BaseExtractor.__subclasses__()
+                if cls not in before and cls.__module__ == module.__name__
+            ]
+            
+            return module, (new_classes[0] if new_classes else None)
             
         except Exception as e:
             self.logger.error(f"Failed to load module {plugin_name}: {e}")
-            return None
+            return None, None
     
     def _find_extractor_class(self, module: object) -> Optional[Type[BaseExtractor]]:
         """Find BaseExtractor subclass in module"""
@@ -425,12 +962,9 @@ class PluginLoader:
             self.logger.error(f"Failed to find extractor class: {e}")
             return None
     
-    def _validate_extractor(self, extractor_class: Type[BaseExtractor]) -> bool:
-        """Validate extractor class"""
+    def _validate_instance(self, instance: BaseExtractor) -> bool:
+        """Validate an extractor instance"""
         try:
-            # Try to instantiate
-            instance = extractor_class()
-            
             # Check required properties
             if not hasattr(instance, 'supported_domains') or not instance.supported_domains:
                 return False
@@ -2,10 +2,12 @@
 Main plugin manager that coordinates all plugin system components.
 """
 import logging
+import sys
 import threading
-from typing import Dict, List, Optional, Type, Any
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Type, Any
 from pathlib import Path
 import asyncio
+from collections import OrderedDict
 from dataclasses import dataclass
 
 from app.core.extractor.base import BaseExtractor, ExtractorInfo
@@ -13,9 +15,14 @@ from app.core.plugin.loader import PluginLoader, PluginLoadResult
 from app.core.plugin.registry import PluginRegistry, RegisteredPlugin, PluginStatus
 from app.core.plugin.router import URLRouter, RoutingResult, URLInfo
 from app.core.plugin.security import PluginSecurityManager, SecurityPolicy, SecurityViolation
+from app.core.plugin.url_parsing import parse_url
 
 
-@dataclass
+# dataclass(slots=True) is only available from Python 3.10
+_DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class PluginManagerStats:
     """Plugin manager statistics"""
     total_plugins: int = 0
@@ -32,9 +39,27 @@ class PluginManager:
     Main plugin manager that coordinates loading, registration, routing, and security.
     """
     
+    # '__dict__' stays available so tests can still patch methods on an
+    # instance; it is only allocated when such an attribute is set
+    __slots__ = (
+        'logger', 'loader', 'registry', 'router', 'security_manager',
+        'enable_hot_reload', 'lazy_loading', '_initialized', '_lock',
+        '_plugin_locks', '_plugin_locks_guard',
+        '_extractor_instances', '_extractor_lock',
+        '_route_cache', '_route_cache_size', '_route_cache_lock',
+        '_route_cache_hits', '_route_cache_misses', '_sorted_domains_cache',
+        '_fast_route', '_fast_route_valid',
+        '_plugin_loaded_sync_callbacks', '_plugin_loaded_async_callbacks',
+        '_plugin_unloaded_sync_callbacks', '_plugin_unloaded_async_callbacks',
+        '_security_violation_sync_callbacks', '_security_violation_async_callbacks',
+        '__dict__',
+    )
+    
     def __init__(self, plugin_directories: Optional[List[str]] = None,
                  security_policy: Optional[SecurityPolicy] = None,
-                 enable_hot_reload: bool = True):
+                 enable_hot_reload: bool = True,
+                 route_cache_size: int = 1024,
+                 lazy_loading: bool = False):
         self.logger = logging.getLogger(__name__)
         
         # Initialize components
@@ -45,15 +70,47 @@ class PluginManager:
         
         # Configuration
         self.enable_hot_reload = enable_hot_reload
+        self.lazy_loading = lazy_loading
         
         # State
         self._initialized = False
-        self._lock = threading.RLock()
+        # Lifecycle lock; only taken in coroutines and never re-entered.
+        # Created on first use, since before Python 3.10 an asyncio.Lock
+        # binds to the event loop current at creation
+        self._lock: Optional[asyncio.Lock] = None
+        
+        # Per-plugin locks so operations on different plugins don't contend,
+        # also created on first use
+        self._plugin_locks: Dict[str, asyncio.Lock] = {}
+        self._plugin_locks_guard = threading.Lock()
+        
+        # Shared extractor instances, created on first use per plugin
+        self._extractor_instances: Dict[str, BaseExtractor] = {}
+        self._extractor_lock = threading.Lock()
         
-        # Event callbacks
-        self._plugin_loaded_callbacks: List[callable] = []
-        self._plugin_unloaded_callbacks: List[callable] = []
-        self._security_violation_callbacks: List[callable] = []
+        # LRU cache of routing results, cleared whenever plugins change
+        self._route_cache: "OrderedDict[str, RoutingResult]" = OrderedDict()
+        self._route_cache_size = route_cache_size
+        self._route_cache_lock = threading.Lock()
+        self._route_cache_hits = 0
+        self._route_cache_misses = 0
+        
+        # Sorted supported domains, rebuilt after plugins change
+        self._sorted_domains_cache: Optional[Tuple[str, ...]] = None
+        
+        # Direct route when exactly one plugin is registered:
+        # (plugin, extractor, exact domains, '.domain' suffixes)
+        self._fast_route: Optional[Tuple[RegisteredPlugin, BaseExtractor, frozenset, Tuple[str, ...]]] = None
+        self._fast_route_valid = False
+        
+        # Event callbacks, split by kind when added so dispatch needs no
+        # per-call coroutine check
+        self._plugin_loaded_sync_callbacks: List[callable] = []
+        self._plugin_loaded_async_callbacks: List[callable] = []
+        self._plugin_unloaded_sync_callbacks: List[callable] = []
+        self._plugin_unloaded_async_callbacks: List[callable] = []
+        self._security_violation_sync_callbacks: List[callable] = []
+        self._security_violation_async_callbacks: List[callable] = []
     
     async def initialize(self) -> bool:
         """
@@ -62,56 +119,79 @@ class PluginManager:
         Returns:
             True if initialization successful, False otherwise
         """
-        with self._lock:
+        # Held throughout so concurrent calls don't load plugins twice
+        async with self._lifecycle_lock():
             if self._initialized:
                 return True
             
-            try:
-                self.logger.info("Initializing plugin manager...")
-                
-                # Enable hot reload if requested
-                if self.enable_hot_reload:
-                    self.loader.enable_hot_reload()
-                
+            return await self._initialize()
+    
+    async def _initialize(self) -> bool:
+        """Load and register all plugins (caller holds the lifecycle lock)"""
+        try:
+            self.logger.info("Initializing plugin manager...")
+            
+            # Enable hot reload if requested
+            if self.enable_hot_reload:
+                self.loader.enable_hot_reload()
+            
+            if self.lazy_loading:
+                # Register plugins by their declared domains and import them
+                # on first use; plugins without literal domains load now
+                manifests = self.loader.scan_all_plugins()
+                for plugin_name, domains in manifests.items():
+                    if domains:
+                        self.registry.register_lazy_plugin(plugin_name, domains)
+                self._sorted_domains_cache = None
+                load_results = [
+                    self.loader.load_plugin(plugin_name)
+                    for plugin_name, domains in manifests.items() if not domains
+                ]
+            else:
                 # Load all plugins
                 load_results = self.loader.load_all_plugins()
-                
-                # Register loaded plugins
-                success_count = 0
-                for result in load_results:
-                    if result.success and result.extractor_class:
-                        if await self._register_plugin_safely(result):
-                            success_count += 1
-                
-                self._initialized = True
-                self.logger.info(f"Plugin manager initialized with {success_count} plugins")
-                return True
-                
-            except Exception as e:
-                self.logger.error(f"Failed to initialize plugin manager: {e}")
-                return False
+            
+            # Register loaded plugins concurrently; the registry guards its own state
+            results = await asyncio.gather(*[
+                self._register_plugin_safely(result) for result in load_results
+                if result.success and result.extractor_class
+            ])
+            success_count = sum(1 for ok in results if ok)
+            self._clear_route_cache()
+            
+            self._initialized = True
+            self.logger.info(f"Plugin manager initialized with {success_count} plugins")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to initialize plugin manager: {e}")
+            return False
     
     async def shutdown(self):
         """Shutdown the plugin manager"""
-        with self._lock:
-            if not self._initialized:
-                return
+        async with self._lifecycle_lock():
+            self._shutdown_sync()
+    
+    def _shutdown_sync(self):
+        """Shutdown without awaiting, usable whether or not an event loop is running"""
+        if not self._initialized:
+            return
+        
+        try:
+            self.logger.info("Shutting down plugin manager...")
             
-            try:
-                self.logger.info("Shutting down plugin manager...")
-                
-                # Disable hot reload
-                self.loader.disable_hot_reload()
-                
-                # Clear all caches
-                self.registry.clear_cache()
-                self.router.clear_cache()
-                
-                self._initialized = False
-                self.logger.info("Plugin manager shut down")
-                
-            except Exception as e:
-                self.logger.error(f"Error during plugin manager shutdown: {e}")
+            # Disable hot reload
+            self.loader.disable_hot_reload()
+            
+            # Clear all caches
+            self.registry.clear_cache()
+            self._clear_route_cache()
+            
+            self._initialized = False
+            self.logger.info("Plugin manager shut down")
+            
+        except Exception as e:
+            self.logger.error(f"Error during plugin manager shutdown: {e}")
     
     async def load_plugin(self, plugin_name: str) -> bool:
         """
@@ -123,25 +203,14 @@ class PluginManager:
         Returns:
             True if successful, False otherwise
         """
-        with self._lock:
-            try:
-                # Load plugin
-                result = self.loader.load_plugin(plugin_name)
-                
-                if result.success and result.extractor_class:
-                    # Register plugin
-                    success = await self._register_plugin_safely(result)
-                    if success:
-                        # Notify callbacks
-                        await self._notify_plugin_loaded(plugin_name)
-                    return success
-                else:
-                    self.logger.error(f"Failed to load plugin {plugin_name}: {result.error_message}")
-                    return False
-                    
-            except Exception as e:
-                self.logger.error(f"Error loading plugin {plugin_name}: {e}")
-                return False
+        async with self._plugin_lock(plugin_name):
+            success = await self._load_plugin(plugin_name)
+        self._clear_route_cache()
+        
+        if success:
+            # Notify callbacks
+            await self._notify_plugin_loaded(plugin_name)
+        return success
     
     async def unload_plugin(self, plugin_name: str) -> bool:
         """
@@ -153,26 +222,14 @@ class PluginManager:
         Returns:
             True if successful, False otherwise
         """
-        with self._lock:
-            try:
-                # Unregister from registry
-                self.registry.unregister_plugin(plugin_name)
-                
-                # Unload from loader
-                self.loader.unload_plugin(plugin_name)
-                
-                # Clear security violations
-                self.security_manager.clear_violations(plugin_name)
-                
-                # Notify callbacks
-                await self._notify_plugin_unloaded(plugin_name)
-                
-                self.logger.info(f"Successfully unloaded plugin: {plugin_name}")
-                return True
-                
-            except Exception as e:
-                self.logger.error(f"Error unloading plugin {plugin_name}: {e}")
-                return False
+        async with self._plugin_lock(plugin_name):
+            success = self._unload_plugin(plugin_name)
+        self._clear_route_cache()
+        
+        if success:
+            # Notify callbacks
+            await self._notify_plugin_unloaded(plugin_name)
+        return success
     
     async def reload_plugin(self, plugin_name: str) -> bool:
         """
@@ -184,11 +241,101 @@ class PluginManager:
         Returns:
             True if successful, False otherwise
         """
-        # Unload first
-        await self.unload_plugin(plugin_name)
+        async with self._plugin_lock(plugin_name):
+            # Unload first
+            unloaded = self._unload_plugin(plugin_name)
+            
+            # Then load again
+            success = await self._load_plugin(plugin_name)
+        self._clear_route_cache()
         
-        # Then load again
-        return await self.load_plugin(plugin_name)
+        if unloaded:
+            await self._notify_plugin_unloaded(plugin_name)
+        if success:
+            await self._notify_plugin_loaded(plugin_name)
+        return success
+    
+    async def _materialize_plugin(self, plugin_name: str) -> Optional[RegisteredPlugin]:
+        """
+        Import and register a lazily registered plugin on first use.
+        
+        Args:
+            plugin_name: Name of the plugin
+            
+        Returns:
+            The active RegisteredPlugin, or None if loading failed
+        """
+        loaded = False
+        async with self._plugin_lock(plugin_name):
+            plugin = self.registry.get_plugin(plugin_name)
+            if plugin is not None and plugin.status == PluginStatus.LAZY:
+                loaded = await self._load_plugin(plugin_name)
+                if not loaded:
+                    # Stop routing to a plugin that can't be loaded
+                    self.registry.set_plugin_status(plugin_name, PluginStatus.ERROR,
+                                                    "Failed to load lazy plugin")
+                plugin = self.registry.get_plugin(plugin_name)
+                self._clear_route_cache()
+        
+        if loaded:
+            await self._notify_plugin_loaded(plugin_name)
+        
+        if plugin is None or plugin.status != PluginStatus.ACTIVE:
+            return None
+        return plugin
+    
+    def _lifecycle_lock(self) -> asyncio.Lock:
+        """Get the lock serializing initialize and shutdown"""
+        with self._plugin_locks_guard:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            return self._lock
+    
+    def _plugin_lock(self, plugin_name: str) -> asyncio.Lock:
+        """Get the lock serializing lifecycle operations on a plugin"""
+        with self._plugin_locks_guard:
+            lock = self._plugin_locks.get(plugin_name)
+            if lock is None:
+                lock = self._plugin_locks[plugin_name] = asyncio.Lock()
+            return lock
+    
+    async def _load_plugin(self, plugin_name: str) -> bool:
+        """Load and register a plugin (caller holds the plugin lock)"""
+        try:
+            # Load plugin
+            result = self.loader.load_plugin(plugin_name)
+            
+            if result.success and result.extractor_class:
+                # Register plugin
+                return await self._register_plugin_safely(result)
+            else:
+                self.logger.error(f"Failed to load plugin {plugin_name}: {result.error_message}")
+                return False
+                
+        except Exception as e:
+            self.logger.error(f"Error loading plugin {plugin_name}: {e}")
+            return False
+    
+    def _unload_plugin(self, plugin_name: str) -> bool:
+        """Unregister and unload a plugin (caller holds the plugin lock)"""
+        try:
+            # Unregister from registry
+            self.registry.unregister_plugin(plugin_name)
+            self._extractor_instances.pop(plugin_name, None)
+            self._sorted_domains_cache = None
+            
+            # Unload from loader
+            self.loader.unload_plugin(plugin_name)
+            
+            # Clear security violations
+            self.security_manager.clear_violations(plugin_name)
+            
+            self.logger.info(f"Successfully unloaded plugin: {plugin_name}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error unloading plugin {plugin_name}: {e}")
+            return False
     
     async def route_url(self, url: str) -> RoutingResult:
         """
@@ -200,7 +347,74 @@ class PluginManager:
         Returns:
             RoutingResult object
         """
-        return self.router.route_url(url)
+        return self._route(url)
+    
+    def _route(self, url: str) -> RoutingResult:
+        """Route a URL through the LRU routing cache"""
+        with self._route_cache_lock:
+            result = self._route_cache.get(url)
+            if result is not None:
+                self._route_cache.move_to_end(url)
+                self._route_cache_hits += 1
+                return result
+            self._route_cache_misses += 1
+        
+        result = self.router.route_url(url)
+        
+        with self._route_cache_lock:
+            self._route_cache[url] = result
+            self._route_cache.move_to_end(url)
+            if len(self._route_cache) > self._route_cache_size:
+                self._route_cache.popitem(last=False)
+        return result
+    
+    def _clear_route_cache(self):
+        """Drop cached routing results after the set of plugins changed"""
+        with self._route_cache_lock:
+            self._route_cache.clear()
+        self.router.clear_cache()
+        self._fast_route_valid = False
+    
+    def _fast_route_plugin(self, url: str) -> Optional[RegisteredPlugin]:
+        """
+        Match a URL directly against the only registered plugin.
+        
+        Single-plugin deployments skip the router and registry lookups.
+        Returns None whenever the generic routing path has to decide.
+        """
+        if not self._fast_route_valid:
+            self._fast_route = self._build_fast_route()
+            self._fast_route_valid = True
+        
+        fast_route = self._fast_route
+        if fast_route is None:
+            return None
+        
+        plugin, extractor, exact_domains, domain_suffixes = fast_route
+        try:
+            host = parse_url(url).hostname
+        except ValueError:
+            return None
+        if host not in exact_domains and not host.endswith(domain_suffixes):
+            return None
+        try:
+            return plugin if extractor.can_handle(url) else None
+        except Exception:
+            return None
+    
+    def _build_fast_route(self):
+        """Build the direct route if exactly one active, shareable plugin is registered"""
+        plugins = self.registry.get_all_plugins()
+        if len(plugins) != 1:
+            return None
+        
+        plugin = next(iter(plugins.values()))
+        if plugin.status != PluginStatus.ACTIVE or not plugin.extractor_class.is_stateless:
+            return None
+        
+        domains = [d.lower().strip('.') for d in plugin.supported_domains]
+        return (plugin, self._get_extractor(plugin), frozenset(domains),
+                tuple('.' + d for d in domains))
     
     async def extract_info(self, url: str) -> Optional[Dict[str, Any]]:
         """
@@ -213,23 +427,27 @@ class PluginManager:
             Extracted information dictionary or None if failed
         """
         try:
-            # Route URL to plugin
-            routing_result = await self.route_url(url)
-            
-            if not routing_result.success or not routing_result.plugin:
-                self.logger.warning(f"No suitable plugin found for URL: {url}")
-                return None
+            plugin = self._fast_route_plugin(url)
+            if plugin is None:
+                # Route URL to plugin
+                routing_result = await self.route_url(url)
+                
+                if not routing_result.success or not routing_result.plugin:
+                    self.logger.warning(f"No suitable plugin found for URL: {url}")
+                    return None
+                
+                plugin = routing_result.plugin
+                if plugin.status == PluginStatus.LAZY:
+                    plugin = await self._materialize_plugin(plugin.name)
+                    if plugin is None:
+                        return None
             
-            # Create extractor instance
-            plugin = routing_result.plugin
-            extractor = plugin.extractor_class()
+            # Get extractor instance
+            extractor = self._get_extractor(plugin)
             
             # Execute extraction with security monitoring
-            def extract_func():
-                return asyncio.run(extractor.extract_info(url))
-            
-            info = self.security_manager.monitor_plugin_execution(
-                plugin.name, extract_func
+            info = await self.security_manager.monitor_plugin_execution_async(
+                plugin.name, self._run_extractor(extractor.extract_info, url)
             )
             
             return info
@@ -249,22 +467,26 @@ class PluginManager:
             VideoMetadata object or None if failed
         """
         try:
-            # Route URL to plugin
-            routing_result = await self.route_url(url)
-            
-            if not routing_result.success or not routing_result.plugin:
-                return None
+            plugin = self._fast_route_plugin(url)
+            if plugin is None:
+                # Route URL to plugin
+                routing_result = await self.route_url(url)
+                
+                if not routing_result.success or not routing_result.plugin:
+                    return None
+                
+                plugin = routing_result.plugin
+                if plugin.status == PluginStatus.LAZY:
+                    plugin = await self._materialize_plugin(plugin.name)
+                    if plugin is None:
+                        return None
             
-            # Create extractor instance
-            plugin = routing_result.plugin
-            extractor = plugin.extractor_class()
+            # Get extractor instance
+            extractor = self._get_extractor(plugin)
             
             # Execute metadata extraction with security monitoring
-            def metadata_func():
-                return asyncio.run(extractor.get_metadata(url))
-            
-            metadata = self.security_manager.monitor_plugin_execution(
-                plugin.name, metadata_func
+            metadata = await self.security_manager.monitor_plugin_execution_async(
+                plugin.name, self._run_extractor(extractor.get_metadata, url)
             )
             
             return metadata
@@ -273,6 +495,37 @@ class PluginManager:
             self.logger.error(f"Error getting metadata from {url}: {e}")
             return None
     
+    def _get_extractor(self, plugin: RegisteredPlugin) -> BaseExtractor:
+        """
+        Get the shared extractor instance for a plugin.
+        
+        Extractors that set ``is_stateless = False`` get a new instance
+        per call.
+        
+        Args:
+            plugin: Registered plugin
+            
+        Returns:
+            Extractor instance
+        """
+        extractor_class = plugin.extractor_class
+        if not extractor_class.is_stateless:
+            return extractor_class()
+        
+        extractor = self._extractor_instances.get(plugin.name)
+        if extractor is None or type(extractor) is not extractor_class:
+            with self._extractor_lock:
+                extractor = self._extractor_instances.get(plugin.name)
+                if extractor is None or type(extractor) is not extractor_class:
+                    extractor = self._extractor_instances[plugin.name] = extractor_class()
+        return extractor
+    
+    def _run_extractor(self, method, url: str):
+        """Get an awaitable for an extractor method, running legacy sync methods in the executor"""
+        if asyncio.iscoroutinefunction(method):
+            return method(url)
+        return asyncio.get_running_loop().run_in_executor(None, method, url)
+    
     def get_plugin_info(self, plugin_name: str) -> Optional[RegisteredPlugin]:
         """
         Get information about a specific plugin.
@@ -285,32 +538,35 @@ class PluginManager:
         """
         return self.registry.get_plugin(plugin_name)
     
-    def get_all_plugins(self) -> Dict[str, RegisteredPlugin]:
+    def get_all_plugins(self) -> Mapping[str, RegisteredPlugin]:
         """
         Get information about all plugins.
         
         Returns:
-            Dictionary mapping plugin names to RegisteredPlugin objects
+            Read-only live mapping of plugin names to RegisteredPlugin objects
         """
         return self.registry.get_all_plugins()
     
-    def get_active_plugins(self) -> Dict[str, RegisteredPlugin]:
+    def get_active_plugins(self) -> Mapping[str, RegisteredPlugin]:
         """
         Get all active plugins.
         
         Returns:
-            Dictionary mapping plugin names to active RegisteredPlugin objects
+            Read-only live mapping of plugin names to active RegisteredPlugin objects
         """
         return self.registry.get_active_plugins()
     
-    def get_supported_domains(self) -> List[str]:
+    def get_supported_domains(self) -> Sequence[str]:
         """
         Get all supported domains.
         
         Returns:
-            List of supported domain names
+            Sorted tuple of supported domain names, shared between calls
         """
-        return sorted(list(self.registry.get_supported_domains()))
+        domains = self._sorted_domains_cache
+        if domains is None:
+            domains = self._sorted_domains_cache = tuple(sorted(self.registry.get_supported_domains()))
+        return domains
     
     def get_supported_platforms(self) -> List[str]:
         """
@@ -331,7 +587,7 @@ class PluginManager:
         Returns:
             True if supported, False otherwise
         """
-        return self.router.is_supported_url(url)
+        return self._route(url).success
     
     def get_url_info(self, url: str) -> Optional[URLInfo]:
         """
@@ -343,6 +599,10 @@ class PluginManager:
         Returns:
             URLInfo object or None if analysis failed
         """
+        with self._route_cache_lock:
+            result = self._route_cache.get(url)
+        if result is not None and result.url_info is not None:
+            return result.url_info
         return self.router.get_url_info(url)
     
     def get_security_violations(self, plugin_name: Optional[str] = None) -> Dict[str, List[SecurityViolation]]:
@@ -369,38 +629,48 @@ class PluginManager:
             PluginManagerStats object
         """
         registry_stats = self.registry.get_statistics()
-        cache_stats = self.router.get_cache_stats()
-        all_violations = self.security_manager.get_all_violations()
-        
-        total_violations = sum(len(violations) for violations in all_violations.values())
+        total_violations = self.security_manager.get_total_violation_count()
         
         return PluginManagerStats(
             total_plugins=registry_stats['total_plugins'],
             active_plugins=registry_stats['active_plugins'],
             failed_plugins=registry_stats['total_plugins'] - registry_stats['active_plugins'],
             total_domains=registry_stats['total_domains'],
-            cache_hits=registry_stats['cache_hits'],
-            cache_misses=registry_stats['cache_misses'],
+            cache_hits=registry_stats['cache_hits'] + self._route_cache_hits,
+            cache_misses=registry_stats['cache_misses'] + self._route_cache_misses,
             security_violations=total_violations
         )
     
     def clear_caches(self):
         """Clear all caches"""
         self.registry.clear_cache()
-        self.router.clear_cache()
+        self._clear_route_cache()
+        self._sorted_domains_cache = None
         self.logger.info("All plugin caches cleared")
     
     def add_plugin_loaded_callback(self, callback: callable):
         """Add callback for plugin loaded events"""
-        self._plugin_loaded_callbacks.append(callback)
+        self._add_callback(callback, self._plugin_loaded_sync_callbacks,
+                           self._plugin_loaded_async_callbacks)
     
     def add_plugin_unloaded_callback(self, callback: callable):
         """Add callback for plugin unloaded events"""
-        self._plugin_unloaded_callbacks.append(callback)
+        self._add_callback(callback, self._plugin_unloaded_sync_callbacks,
+                           self._plugin_unloaded_async_callbacks)
     
     def add_security_violation_callback(self, callback: callable):
         """Add callback for security violation events"""
-        self._security_violation_callbacks.append(callback)
+        self._add_callback(callback, self._security_violation_sync_callbacks,
+                           self._security_violation_async_callbacks)
+    
+    @staticmethod
+    def _add_callback(callback: callable, sync_callbacks: List[callable],
+                      async_callbacks: List[callable]):
+        """Add a callback to the sync or async list depending on its kind"""
+        if asyncio.iscoroutinefunction(callback):
+            async_callbacks.append(callback)
+        else:
+            sync_callbacks.append(callback)
     
     async def _register_plugin_safely(self, load_result: PluginLoadResult) -> bool:
         """Register a plugin with security checks"""
@@ -411,7 +681,10 @@ class PluginManager:
             # Security validation
             plugin_file = self.loader._find_plugin_file(plugin_name)
             if plugin_file:
-                violations = self.security_manager.validate_plugin_file(plugin_file)
+                # Reading and scanning the file would block the event loop
+                violations = await asyncio.get_running_loop().run_in_executor(
+                    None, self.security_manager.validate_plugin_file, plugin_file
+                )
                 
                 # Check for critical violations
                 critical_violations = [v for v in violations if v.severity == "critical"]
@@ -427,6 +700,7 @@ class PluginManager:
             # Register in registry
             success = self.registry.register_plugin(plugin_name, extractor_class, info)
             
+            self._sorted_domains_cache = None
             if success:
                 self.logger.info(f"Successfully registered plugin: {plugin_name}")
             else:
@@ -441,36 +715,34 @@ class PluginManager:
     
     async def _notify_plugin_loaded(self, plugin_name: str):
         """Notify callbacks about plugin loaded event"""
-        for callback in self._plugin_loaded_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(plugin_name)
-                else:
-                    callback(plugin_name)
-            except Exception as e:
-                self.logger.error(f"Error in plugin loaded callback: {e}")
+        await self._dispatch("plugin loaded", self._plugin_loaded_sync_callbacks,
+                             self._plugin_loaded_async_callbacks, plugin_name)
     
     async def _notify_plugin_unloaded(self, plugin_name: str):
         """Notify callbacks about plugin unloaded event"""
-        for callback in self._plugin_unloaded_callbacks:
-            try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(plugin_name)
-                else:
-                    callback(plugin_name)
-            except Exception as e:
-                self.logger.error(f"Error in plugin unloaded callback: {e}")
+        await self._dispatch("plugin unloaded", self._plugin_unloaded_sync_callbacks,
+                             self._plugin_unloaded_async_callbacks, plugin_name)
     
     async def _notify_security_violations(self, plugin_name: str, violations: List[SecurityViolation]):
         """Notify callbacks about security violations"""
-        for callback in self._security_violation_callbacks:
+        await self._dispatch("security violation", self._security_violation_sync_callbacks,
+                             self._security_violation_async_callbacks, plugin_name, violations)
+    
+    async def _dispatch(self, event: str, sync_callbacks: List[callable],
+                        async_callbacks: List[callable], *args):
+        """Call sync callbacks in order, then run async callbacks concurrently"""
+        for callback in sync_callbacks:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(plugin_name, violations)
-                else:
-                    callback(plugin_name, violations)
+                callback(*args)
             except Exception as e:
-                self.logger.error(f"Error in security violation callback: {e}")
+                self.logger.error(f"Error in {event} callback: {e}")
+        
+        if async_callbacks:
+            results = await asyncio.gather(*(callback(*args) for callback in async_callbacks),
+                                           return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.logger.error(f"Error in {event} callback: {result}")
     
     def __enter__(self):
         """Context manager entry"""
@@ -478,4 +750,13 @@ class PluginManager:
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit"""
-        asyncio.run(self.shutdown())
\ No newline at end of file
+        # asyncio.run would fail inside a running event loop
+        self._shutdown_sync()
+    
+    async def __aenter__(self):
+        """Async context manager entry"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.shutdown()
\ No newline at end of file
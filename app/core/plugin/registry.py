@@ -1,14 +1,20 @@
 """
 Plugin registry for managing and organizing loaded plugins.
 """
+import itertools
 import logging
-from typing import Dict, List, Optional, Set, Type
-from urllib.parse import urlparse
+import re
+import sys
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, NamedTuple, Optional, Pattern, Set, Type
 import threading
 from dataclasses import dataclass, field
 from enum import Enum
 
 from app.core.extractor.base import BaseExtractor, ExtractorInfo
+from app.core.plugin.domain_trie import DomainTrie
+from app.core.plugin.url_parsing import parse_url
 
 
 class PluginStatus(Enum):
@@ -17,20 +23,105 @@ class PluginStatus(Enum):
     INACTIVE = "inactive"
     ERROR = "error"
     LOADING = "loading"
+    LAZY = "lazy"  # Domains are known but the module is not imported yet
+
+
+# Statuses of plugins that URLs can be routed to
+_ROUTABLE_STATUSES = (PluginStatus.ACTIVE, PluginStatus.LAZY)
+
+# Candidate order only considers usage in steps of 2**_USAGE_BUCKET_BITS
+_USAGE_BUCKET_BITS = 4
+_USAGE_BUCKET_MASK = (1 << _USAGE_BUCKET_BITS) - 1
+
+
+def _normalize_domains(domains) -> List[str]:
+    """Lower-case and intern domains once so lookups can skip it"""
+    return [sys.intern(domain.lower()) for domain in domains]
 
 
 @dataclass
 class RegisteredPlugin:
     """Information about a registered plugin"""
     name: str
-    extractor_class: Type[BaseExtractor]
-    info: ExtractorInfo
+    extractor_class: Optional[Type[BaseExtractor]]  # None while LAZY
+    info: Optional[ExtractorInfo]
     status: PluginStatus = PluginStatus.ACTIVE
     supported_domains: List[str] = field(default_factory=list)
     priority: int = 0  # Higher priority plugins are preferred
     error_message: Optional[str] = None
     load_time: Optional[float] = None
-    usage_count: int = 0
+    instance: Optional[BaseExtractor] = None  # Shared for can_handle() checks
+    _uses: Iterator[int] = field(default_factory=itertools.count, init=False,
+                                 repr=False, compare=False)
+    _usage_count: int = field(default=0, init=False, repr=False, compare=False)
+    _name_lower: str = field(init=False, repr=False, compare=False)
+    _domain_pattern: Optional[Pattern] = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Precomputed for routing confidence checks
+        self._name_lower = self.name.lower()
+        self._domain_pattern = (
+            re.compile('|'.join(map(re.escape, self.supported_domains)))
+            if self.supported_domains else None
+        )
+    
+    def name_contains(self, text: str) -> bool:
+        """Check if text occurs in the lower-cased plugin name"""
+        return text in self._name_lower
+    
+    def domain_in(self, host: str) -> bool:
+        """Check if any supported domain occurs in a (lower-case) host"""
+        return self._domain_pattern is not None and self._domain_pattern.search(host) is not None
+    
+    @property
+    def usage_count(self) -> int:
+        """Number of URLs routed to this plugin"""
+        return self._usage_count
+    
+    def record_use(self):
+        """Count one use without needing the registry lock"""
+        # next() on itertools.count is atomic, so concurrent uses are never
+        # lost from the count. The stored value may trail it until the next
+        # use when two uses race, and stays short if none follows.
+        self._usage_count = next(self._uses) + 1
+    
+    def reset_usage(self):
+        """Reset the usage count"""
+        self._uses = itertools.count()
+        self._usage_count = 0
+
+
+class CacheCounter:
+    """
+    Cache hit and miss counts that can be bumped without a lock.
+    
+    next() on itertools.count is atomic, so concurrent increments are never
+    lost from the counts. The stored values may trail them until the next
+    increment when two increments race, and stay short if none follows.
+    """
+    
+    __slots__ = ('_hits', '_misses', 'hits', 'misses')
+    
+    def __init__(self):
+        self._hits = itertools.count()
+        self._misses = itertools.count()
+        self.hits = 0
+        self.misses = 0
+    
+    def hit(self):
+        """Count one cache hit"""
+        self.hits = next(self._hits) + 1
+    
+    def miss(self):
+        """Count one cache miss"""
+        self.misses = next(self._misses) + 1
+
+
+class _FrozenIndex(NamedTuple):
+    """Copy of the plugin and domain index that lock-free readers can share"""
+    plugins: Mapping[str, RegisteredPlugin]
+    domain_map: DomainTrie
+    candidates: Dict[str, List[RegisteredPlugin]]  # host -> sorted candidates
 
 
 class PluginRegistry:
@@ -39,13 +130,21 @@ class PluginRegistry:
     Provides efficient lookup and management of extractor plugins.
     """
     
-    def __init__(self):
+    def __init__(self, url_cache_size: int = 1000):
         self.logger = logging.getLogger(__name__)
         
         # Plugin storage
         self._plugins: Dict[str, RegisteredPlugin] = {}
-        self._domain_map: Dict[str, List[str]] = {}  # domain -> plugin names
-        self._url_cache: Dict[str, str] = {}  # URL -> plugin name cache
+        self._domain_map = DomainTrie()  # domain -> plugin names, matches subdomains
+        self._domain_counts: Dict[str, int] = {}  # domain -> number of plugins
+        self._url_cache: "OrderedDict[str, str]" = OrderedDict()  # URL -> plugin name LRU cache
+        self._url_cache_size = url_cache_size
+        self._active_plugins: Dict[str, RegisteredPlugin] = {}
+        self._candidate_cache: Dict[str, List[RegisteredPlugin]] = {}  # host -> sorted candidates
+        
+        # Read-only live views handed out instead of copies
+        self._plugins_view = MappingProxyType(self._plugins)
+        self._active_plugins_view = MappingProxyType(self._active_plugins)
         
         # Thread safety
         self._lock = threading.RLock()
@@ -54,10 +153,14 @@ class PluginRegistry:
         self._stats = {
             'total_plugins': 0,
             'active_plugins': 0,
-            'total_domains': 0,
-            'cache_hits': 0,
-            'cache_misses': 0
+            'total_domains': 0
         }
+        
+        # URL cache hits and misses, counted without the lock
+        self._cache_counts = CacheCounter()
+        
+        # Set while frozen; lookups then read it without taking the lock
+        self._frozen_index: Optional[_FrozenIndex] = None
     
     def register_plugin(self, name: str, extractor_class: Type[BaseExtractor], 
                        info: ExtractorInfo, priority: int = 0) -> bool:
@@ -77,7 +180,7 @@ class PluginRegistry:
             try:
                 # Create instance to get supported domains
                 instance = extractor_class()
-                supported_domains = instance.supported_domains
+                supported_domains = _normalize_domains(instance.supported_domains)
                 
                 # Create registered plugin
                 plugin = RegisteredPlugin(
@@ -85,17 +188,24 @@ class PluginRegistry:
                     extractor_class=extractor_class,
                     info=info,
                     supported_domains=supported_domains,
-                    priority=priority
+                    priority=priority,
+                    instance=instance
                 )
                 
+                # Replace a previous (e.g. lazy) registration
+                previous = self._plugins.get(name)
+                if previous is not None:
+                    self._remove_domain_mapping(name, previous.supported_domains)
+                
                 # Store plugin
                 self._plugins[name] = plugin
+                self._active_plugins[name] = plugin
                 
                 # Update domain mapping
                 self._update_domain_mapping(name, supported_domains)
                 
                 # Clear URL cache as new plugin might handle cached URLs
-                self._url_cache.clear()
+                self._index_changed()
                 
                 # Update statistics
                 self._update_stats()
@@ -107,6 +217,42 @@ class PluginRegistry:
                 self.logger.error(f"Failed to register plugin {name}: {e}")
                 return False
     
+    def register_lazy_plugin(self, name: str, supported_domains: List[str],
+                             priority: int = 0) -> bool:
+        """
+        Register a plugin by its domains only, deferring the module import.
+        
+        The plugin is routable in LAZY status until it is registered again
+        with register_plugin.
+        
+        Args:
+            name: Plugin name
+            supported_domains: Domains declared by the plugin
+            priority: Plugin priority (higher = preferred)
+            
+        Returns:
+            True if registration successful, False otherwise
+        """
+        with self._lock:
+            if name in self._plugins:
+                return False
+            
+            plugin = RegisteredPlugin(
+                name=name,
+                extractor_class=None,
+                info=None,
+                status=PluginStatus.LAZY,
+                supported_domains=_normalize_domains(supported_domains),
+                priority=priority
+            )
+            self._plugins[name] = plugin
+            self._update_domain_mapping(name, plugin.supported_domains)
+            self._index_changed()
+            self._update_stats()
+            
+            self.logger.info(f"Registered lazy plugin: {name} (domains: {plugin.supported_domains})")
+            return True
+    
     def unregister_plugin(self, name: str) -> bool:
         """
         Unregister a plugin from the registry.
@@ -129,9 +275,10 @@ class PluginRegistry:
                 
                 # Remove plugin
                 del self._plugins[name]
+                self._active_plugins.pop(name, None)
                 
                 # Clear URL cache
-                self._url_cache.clear()
+                self._index_changed()
                 
                 # Update statistics
                 self._update_stats()
@@ -156,28 +303,28 @@ class PluginRegistry:
         with self._lock:
             return self._plugins.get(name)
     
-    def get_all_plugins(self) -> Dict[str, RegisteredPlugin]:
+    def get_all_plugins(self) -> Mapping[str, RegisteredPlugin]:
         """
         Get all registered plugins.
         
+        The result is a read-only view that reflects later registrations;
+        copy it with dict() before iterating if plugins may change meanwhile.
+        
         Returns:
-            Dictionary mapping plugin names to RegisteredPlugin objects
+            Mapping of plugin names to RegisteredPlugin objects
         """
-        with self._lock:
-            return self._plugins.copy()
+        return self._plugins_view
     
-    def get_active_plugins(self) -> Dict[str, RegisteredPlugin]:
+    def get_active_plugins(self) -> Mapping[str, RegisteredPlugin]:
         """
         Get all active plugins.
         
+        The result is a read-only live view like get_all_plugins.
+        
         Returns:
-            Dictionary mapping plugin names to active RegisteredPlugin objects
+            Mapping of plugin names to active RegisteredPlugin objects
         """
-        with self._lock:
-            return {
-                name: plugin for name, plugin in self._plugins.items()
-                if plugin.status == PluginStatus.ACTIVE
-            }
+        return self._active_plugins_view
     
     def get_plugins_for_domain(self, domain: str) -> List[RegisteredPlugin]:
         """
@@ -189,18 +336,12 @@ class PluginRegistry:
         Returns:
             List of RegisteredPlugin objects sorted by priority (highest first)
         """
+        index = self._frozen_index
+        if index is not None:
+            return list(self._get_candidate_plugins(domain.lower(), index))
+        
         with self._lock:
-            domain = domain.lower()
-            plugin_names = self._domain_map.get(domain, [])
-            
-            plugins = []
-            for name in plugin_names:
-                if name in self._plugins and self._plugins[name].status == PluginStatus.ACTIVE:
-                    plugins.append(self._plugins[name])
-            
-            # Sort by priority (highest first) and then by usage count
-            plugins.sort(key=lambda p: (-p.priority, -p.usage_count))
-            return plugins
+            return list(self._get_candidate_plugins(domain.lower()))
     
     def get_plugin_for_url(self, url: str) -> Optional[RegisteredPlugin]:
         """
@@ -212,45 +353,71 @@ class PluginRegistry:
         Returns:
             RegisteredPlugin object or None if no suitable plugin found
         """
+        # Cache hits skip the lock; single dict operations are atomic
+        plugin_name = self._url_cache.get(url)
+        if plugin_name is not None:
+            plugin = self._plugins.get(plugin_name)
+            if plugin is not None:
+                try:
+                    self._url_cache.move_to_end(url)
+                except KeyError:
+                    pass  # Evicted by a concurrent writer
+                self._cache_counts.hit()
+                self._record_use(plugin)
+                return plugin
+        
+        index = self._frozen_index
+        if index is not None:
+            # Search the frozen index without the lock; only caching needs it
+            self._cache_counts.miss()
+            plugin = self._find_plugin(url, index)
+            if plugin is not None:
+                with self._lock:
+                    self._cache_url(url, plugin.name)
+            return plugin
+        
         with self._lock:
-            # Check cache first
-            if url in self._url_cache:
-                plugin_name = self._url_cache[url]
+            # Check cache again, it may have been filled meanwhile
+            plugin_name = self._url_cache.get(url)
+            if plugin_name is not None:
                 if plugin_name in self._plugins:
-                    self._stats['cache_hits'] += 1
+                    self._url_cache.move_to_end(url)
+                    self._cache_counts.hit()
                     plugin = self._plugins[plugin_name]
-                    plugin.usage_count += 1
+                    self._record_use(plugin)
                     return plugin
                 else:
                     # Cached plugin no longer exists, remove from cache
                     del self._url_cache[url]
             
-            self._stats['cache_misses'] += 1
-            
-            # Extract domain from URL
-            try:
-                parsed = urlparse(url)
-                domain = parsed.netloc.lower()
-            except Exception:
-                return None
-            
-            # Find plugins for this domain
-            candidate_plugins = self._get_candidate_plugins(domain)
+            self._cache_counts.miss()
             
-            # Test each plugin to see if it can handle the URL
-            for plugin in candidate_plugins:
-                try:
-                    instance = plugin.extractor_class()
-                    if instance.can_handle(url):
-                        # Cache the result
-                        self._url_cache[url] = plugin.name
-                        plugin.usage_count += 1
-                        return plugin
-                except Exception as e:
-                    self.logger.warning(f"Plugin {plugin.name} failed URL test: {e}")
-                    continue
-            
-            return None
+            plugin = self._find_plugin(url)
+            if plugin is not None:
+                self._cache_url(url, plugin.name)
+            return plugin
+    
+    def freeze(self):
+        """
+        Snapshot the plugin and domain index so URL lookups skip the lock.
+        
+        Intended for the steady state after startup. Registering or
+        unregistering plugins still works but rebuilds the snapshot.
+        """
+        with self._lock:
+            self._frozen_index = self._build_frozen_index()
+            self.logger.info("Plugin registry frozen")
+    
+    def unfreeze(self):
+        """Serve lookups from the live index again"""
+        with self._lock:
+            self._frozen_index = None
+            self.logger.info("Plugin registry unfrozen")
+    
+    @property
+    def is_frozen(self) -> bool:
+        """Whether lookups are served from a frozen snapshot"""
+        return self._frozen_index is not None
     
     def set_plugin_status(self, name: str, status: PluginStatus, 
                          error_message: Optional[str] = None) -> bool:
@@ -272,6 +439,11 @@ class PluginRegistry:
             plugin = self._plugins[name]
             plugin.status = status
             plugin.error_message = error_message
+            if status == PluginStatus.ACTIVE:
+                self._active_plugins[name] = plugin
+            else:
+                self._active_plugins.pop(name, None)
+            self._clear_candidates()
             
             # Update statistics
             self._update_stats()
@@ -294,6 +466,7 @@ class PluginRegistry:
                 return False
             
             self._plugins[name].priority = priority
+            self._clear_candidates()
             return True
     
     def get_supported_domains(self) -> Set[str]:
@@ -304,7 +477,7 @@ class PluginRegistry:
             Set of supported domain names
         """
         with self._lock:
-            return set(self._domain_map.keys())
+            return set(self._domain_counts)
     
     def get_statistics(self) -> Dict[str, int]:
         """
@@ -314,12 +487,16 @@ class PluginRegistry:
             Dictionary containing statistics
         """
         with self._lock:
-            return self._stats.copy()
+            stats = self._stats.copy()
+        stats['cache_hits'] = self._cache_counts.hits
+        stats['cache_misses'] = self._cache_counts.misses
+        return stats
     
     def clear_cache(self):
         """Clear the URL cache"""
         with self._lock:
             self._url_cache.clear()
+            self._clear_candidates()
             self.logger.info("Plugin registry cache cleared")
     
     def get_plugin_usage_stats(self) -> Dict[str, int]:
@@ -336,60 +513,131 @@ class PluginRegistry:
         """Reset all plugin usage statistics"""
         with self._lock:
             for plugin in self._plugins.values():
-                plugin.usage_count = 0
+                plugin.reset_usage()
+            self._clear_candidates()
             self.logger.info("Plugin usage statistics reset")
     
+    def _cache_url(self, url: str, plugin_name: str):
+        """Cache the plugin for a URL, evicting the least recently used entries"""
+        self._url_cache[url] = plugin_name
+        self._url_cache.move_to_end(url)
+        while len(self._url_cache) > self._url_cache_size:
+            self._url_cache.popitem(last=False)
+    
     def _update_domain_mapping(self, plugin_name: str, domains: List[str]):
-        """Update domain to plugin mapping"""
+        """Update domain to plugin mapping (domains are already normalized)"""
         for domain in domains:
-            domain = domain.lower()
-            if domain not in self._domain_map:
-                self._domain_map[domain] = []
-            
-            if plugin_name not in self._domain_map[domain]:
-                self._domain_map[domain].append(plugin_name)
+            if self._domain_map.insert(domain, plugin_name):
+                self._domain_counts[domain] = self._domain_counts.get(domain, 0) + 1
     
     def _remove_domain_mapping(self, plugin_name: str, domains: List[str]):
-        """Remove plugin from domain mapping"""
+        """Remove plugin from domain mapping (domains are already normalized)"""
         for domain in domains:
-            domain = domain.lower()
-            if domain in self._domain_map:
-                if plugin_name in self._domain_map[domain]:
-                    self._domain_map[domain].remove(plugin_name)
-                
+            if self._domain_map.remove(domain, plugin_name):
                 # Remove domain entry if no plugins left
-                if not self._domain_map[domain]:
-                    del self._domain_map[domain]
+                count = self._domain_counts[domain] - 1
+                if count:
+                    self._domain_counts[domain] = count
+                else:
+                    del self._domain_counts[domain]
     
-    def _get_candidate_plugins(self, domain: str) -> List[RegisteredPlugin]:
-        """Get candidate plugins for a domain, including partial matches"""
+    def _find_plugin(self, url: str,
+                     index: Optional[_FrozenIndex] = None) -> Optional[RegisteredPlugin]:
+        """Find and count the plugin for a URL, without touching the URL cache"""
+        # Extract host name from URL (without port or credentials)
+        try:
+            domain = parse_url(url).hostname
+        except Exception:
+            return None
+        
+        # Find plugins for this domain
+        candidate_plugins = self._get_candidate_plugins(domain, index)
+        
+        # Test each plugin to see if it can handle the URL
+        for plugin in candidate_plugins:
+            if plugin.status == PluginStatus.LAZY:
+                # Can't ask an unloaded plugin, the domain match has to do
+                self._record_use(plugin)
+                return plugin
+            
+            try:
+                instance = plugin.instance
+                if instance is None:
+                    instance = plugin.instance = plugin.extractor_class()
+                if instance.can_handle(url):
+                    self._record_use(plugin)
+                    return plugin
+            except Exception as e:
+                self.logger.warning(f"Plugin {plugin.name} failed URL test: {e}")
+                continue
+        
+        return None
+    
+    def _build_frozen_index(self) -> _FrozenIndex:
+        """Copy the plugin map and domain trie"""
+        domain_map = DomainTrie()
+        for name, plugin in self._plugins.items():
+            domain_map.insert_all(plugin.supported_domains, name)
+        return _FrozenIndex(MappingProxyType(dict(self._plugins)), domain_map, {})
+    
+    def _index_changed(self):
+        """Drop lookup caches after plugins were added or removed"""
+        self._url_cache.clear()
+        self._candidate_cache.clear()
+        if self._frozen_index is not None:
+            self._frozen_index = self._build_frozen_index()
+    
+    def _clear_candidates(self):
+        """Drop cached candidate lists, e.g. after an order-relevant change"""
+        self._candidate_cache.clear()
+        index = self._frozen_index
+        if index is not None:
+            index.candidates.clear()
+    
+    def _record_use(self, plugin: RegisteredPlugin):
+        """Count a use of a plugin, re-sorting candidates when its usage bucket changes"""
+        plugin.record_use()
+        if not plugin.usage_count & _USAGE_BUCKET_MASK:
+            self._clear_candidates()
+    
+    def _get_candidate_plugins(self, domain: str,
+                               index: Optional[_FrozenIndex] = None) -> List[RegisteredPlugin]:
+        """
+        Get candidate plugins registered for a host or any of its parent domains.
+        
+        The sorted list is cached per host and shared; callers must not modify it.
+        Reads the frozen index if given, otherwise the live one (lock held).
+        """
+        if index is None:
+            plugins, domain_map, cache = self._plugins, self._domain_map, self._candidate_cache
+        else:
+            plugins, domain_map, cache = index
+        
+        candidates = cache.get(domain)
+        if candidates is not None:
+            return candidates
+        
         candidates = []
+        seen = set()
         
-        # Exact domain match
-        if domain in self._domain_map:
-            for plugin_name in self._domain_map[domain]:
-                if (plugin_name in self._plugins and 
-                    self._plugins[plugin_name].status == PluginStatus.ACTIVE):
-                    candidates.append(self._plugins[plugin_name])
-        
-        # Partial domain matches (e.g., youtube.com matches youtu.be)
-        for mapped_domain, plugin_names in self._domain_map.items():
-            if mapped_domain in domain or domain in mapped_domain:
-                for plugin_name in plugin_names:
-                    if (plugin_name in self._plugins and 
-                        self._plugins[plugin_name].status == PluginStatus.ACTIVE and
-                        self._plugins[plugin_name] not in candidates):
-                        candidates.append(self._plugins[plugin_name])
+        # One trie step per label; most specific domains come first
+        for plugin_name in domain_map.match(domain):
+            plugin = plugins.get(plugin_name)
+            if (plugin is not None and plugin.status in _ROUTABLE_STATUSES
+                    and plugin_name not in seen):
+                seen.add(plugin_name)
+                candidates.append(plugin)
         
         # Sort by priority and usage
-        candidates.sort(key=lambda p: (-p.priority, -p.usage_count))
+        candidates.sort(key=lambda p: (-p.priority, -(p.usage_count >> _USAGE_BUCKET_BITS)))
+        
+        if len(cache) >= self._url_cache_size:
+            cache.clear()
+        cache[domain] = candidates
         return candidates
     
     def _update_stats(self):
         """Update registry statistics"""
         self._stats['total_plugins'] = len(self._plugins)
-        self._stats['active_plugins'] = len([
-            p for p in self._plugins.values() 
-            if p.status == PluginStatus.ACTIVE
-        ])
-        self._stats['total_domains'] = len(self._domain_map)
\ No newline at end of file
+        self._stats['active_plugins'] = len(self._active_plugins)
+        self._stats['total_domains'] = len(self._domain_counts)
\ No newline at end of file
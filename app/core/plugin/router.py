@@ -4,12 +4,100 @@ URL router for intelligent routing of URLs to appropriate plugins.
 import logging
 import re
 from typing import Optional, List, Dict, Tuple, Pattern
-from urllib.parse import urlparse, parse_qs
 from dataclasses import dataclass
 import threading
+from collections import OrderedDict
 from enum import Enum
 
-from app.core.plugin.registry import PluginRegistry, RegisteredPlugin
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+from app.core.plugin.domain_trie import DomainTrie
+from app.core.plugin.registry import CacheCounter, PluginRegistry, RegisteredPlugin
+from app.core.plugin.url_parsing import parse_url
+
+
+# Lookups between routing cache size reviews, and the hit ratio below
+# which a full cache is grown
+_CACHE_TUNE_INTERVAL = 10000
+_CACHE_GROW_HIT_RATIO = 0.4
+
+# Named group openings, made non-capturing when patterns are combined
+_NAMED_GROUP_RE = re.compile(r'\(\?P<[^>]+>')
+
+# Optional scheme/www prefix that all built-in patterns start with
+_URL_PREFIX = '(?:https?://)?(?:www\\.)?'
+
+# Escaped domain literal at the start of a pattern (e.g. 'youtube\.com')
+_DOMAIN_LITERAL_RE = re.compile(r'(?:[a-z0-9-]+\\\.)+[a-z]{2,}', re.IGNORECASE)
+
+# Characters that may follow a required domain literal; anything else (a
+# quantifier, another metacharacter or more host characters) could make the
+# literal optional or change the domain
+_DOMAIN_END_CHARS = frozenset('/:')
+
+# Quantifiers that make a preceding group optional or repeatable
+_QUANTIFIER_CHARS = frozenset('?*+{')
+
+
+def _has_top_level_alternation(pattern: str) -> bool:
+    """Check whether a pattern contains '|' outside of any group or character class"""
+    depth = 0
+    in_class = False
+    escaped = False
+    for char in pattern:
+        if escaped:
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif in_class:
+            in_class = char != ']'
+        elif char == '[':
+            in_class = True
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        elif char == '|' and depth == 0:
+            return True
+    return False
+
+
+def _required_domains(pattern: str) -> Optional[List[str]]:
+    """
+    Get the domains a URL pattern requires, one of which must occur in a match.
+    
+    Only understands patterns of the form prefix + domain or
+    prefix + (?:domain...|domain...); returns None for anything else.
+    """
+    if pattern.startswith(_URL_PREFIX):
+        pattern = pattern[len(_URL_PREFIX):]
+    
+    # A top-level alternative may match without any of the domains
+    if _has_top_level_alternation(pattern):
+        return None
+    
+    if pattern.startswith('(?:'):
+        end = pattern.find(')')
+        group = pattern[3:end]
+        if end < 0 or '(' in group or pattern[end + 1:end + 2] in _QUANTIFIER_CHARS:
+            return None
+        alternatives = group.split('|')
+    else:
+        alternatives = [pattern]
+    
+    domains = []
+    for alternative in alternatives:
+        match = _DOMAIN_LITERAL_RE.match(alternative)
+        if not match:
+            return None
+        following = alternative[match.end():match.end() + 1]
+        if following and following not in _DOMAIN_END_CHARS:
+            return None
+        domains.append(match.group(0).replace('\\.', '.').lower())
+    return domains
 
 
 class URLType(Enum):
@@ -50,6 +138,44 @@ class RoutingResult:
     confidence: float = 0.0  # Confidence score (0.0 - 1.0)
 
 
+class _LazyRoutingResult(RoutingResult):
+    """
+    RoutingResult that analyzes the URL only when url_info or confidence
+    is first accessed, so callers that only need the plugin skip it.
+    """
+    
+    def __init__(self, router: 'URLRouter', url: str, success: bool,
+                 plugin: Optional[RegisteredPlugin] = None,
+                 error_message: Optional[str] = None):
+        self.success = success
+        self.plugin = plugin
+        self.error_message = error_message
+        self._router = router
+        self._url = url
+        self._analysis: Optional[Tuple[Optional[URLInfo], float]] = None
+    
+    @property
+    def url_info(self) -> Optional[URLInfo]:
+        return self._analyze()[0]
+    
+    @property
+    def confidence(self) -> float:
+        return self._analyze()[1]
+    
+    def _analyze(self) -> Tuple[Optional[URLInfo], float]:
+        """Analyze the URL once and score the plugin against it"""
+        analysis = self._analysis
+        if analysis is None:
+            router = self._router
+            with router._lock:
+                url_info = router._analyze_url(self._url)
+            confidence = 0.0
+            if url_info is not None and self.plugin is not None:
+                confidence = router._calculate_confidence(url_info, self.plugin)
+            analysis = self._analysis = (url_info, confidence)
+        return analysis
+
+
 class URLPattern:
     """URL pattern for matching and extracting information"""
     
@@ -65,6 +191,17 @@ class URLPattern:
         self.playlist_id_group = playlist_id_group
         self.channel_id_group = channel_id_group
         self.user_id_group = user_id_group
+        
+        # (URLInfo field, regex group) for each ID this pattern captures,
+        # resolved once instead of checking every group on each match
+        self._id_groups: Tuple[Tuple[str, str], ...] = tuple(
+            (field, group) for field, group in (
+                ('video_id', video_id_group),
+                ('playlist_id', playlist_id_group),
+                ('channel_id', channel_id_group),
+                ('user_id', user_id_group),
+            ) if group
+        )
     
     def match(self, url: str) -> Optional[URLInfo]:
         """
@@ -81,44 +218,30 @@ class URLPattern:
             return None
         
         try:
-            parsed = urlparse(url)
-            query_params = parse_qs(parsed.query)
+            parsed = parse_url(url)
+            query_params = parsed.query_params
             
             # Extract IDs from regex groups
-            video_id = None
-            playlist_id = None
-            channel_id = None
-            user_id = None
-            
-            if self.video_id_group:
-                video_id = match.group(self.video_id_group)
-            
-            if self.playlist_id_group:
-                playlist_id = match.group(self.playlist_id_group)
-            
-            if self.channel_id_group:
-                channel_id = match.group(self.channel_id_group)
+            ids = {field: match.group(group) for field, group in self._id_groups}
             
-            if self.user_id_group:
-                user_id = match.group(self.user_id_group)
-            
-            # Also check query parameters for IDs
-            if not video_id and 'v' in query_params:
-                video_id = query_params['v'][0]
-            
-            if not playlist_id and 'list' in query_params:
-                playlist_id = query_params['list'][0]
+            parameters = {}
+            if query_params:
+                # Also check query parameters for IDs
+                if not ids.get('video_id') and 'v' in query_params:
+                    ids['video_id'] = query_params['v'][0]
+                
+                if not ids.get('playlist_id') and 'list' in query_params:
+                    ids['playlist_id'] = query_params['list'][0]
+                
+                parameters = {k: v[0] if v else '' for k, v in query_params.items()}
             
             return URLInfo(
                 url=url,
-                domain=parsed.netloc.lower(),
+                domain=parsed.netloc,
                 url_type=self.url_type,
                 platform=self.platform,
-                video_id=video_id,
-                playlist_id=playlist_id,
-                channel_id=channel_id,
-                user_id=user_id,
-                parameters={k: v[0] if v else '' for k, v in query_params.items()}
+                parameters=parameters,
+                **ids
             )
             
         except Exception:
@@ -130,16 +253,38 @@ class URLRouter:
     Intelligent URL router that analyzes URLs and routes them to appropriate plugins.
     """
     
-    def __init__(self, registry: PluginRegistry):
+    def __init__(self, registry: PluginRegistry, cache_size: int = 1000,
+                 max_cache_size: int = 16000):
         self.logger = logging.getLogger(__name__)
         self.registry = registry
         
         # URL patterns for different platforms
         self.url_patterns: List[URLPattern] = []
         
-        # Routing cache
-        self._routing_cache: Dict[str, RoutingResult] = {}
-        self._cache_size_limit = 1000
+        # All patterns fused into one alternation; group '__pN' is url_patterns[N]
+        self._combined_pattern: Optional[Pattern] = None
+        self._combined_patterns: List[URLPattern] = []
+        
+        # Domains of which at least one occurs in any URL a pattern matches;
+        # None if some pattern's domains can't be determined
+        self._domain_prefilter: Optional[Pattern] = None
+        
+        # Required domain -> indices (as str) of the patterns requiring it;
+        # None under the same condition as the pre-filter
+        self._patterns_by_domain: Optional[DomainTrie] = None
+        
+        # Hyperscan database of all patterns (ids are url_patterns indices),
+        # used instead of the combined regex when hyperscan is installed
+        self._hs_database = None
+        
+        # Routing cache (LRU)
+        self._routing_cache: "OrderedDict[str, RoutingResult]" = OrderedDict()
+        self._cache_size_limit = cache_size
+        self._max_cache_size = max(cache_size, max_cache_size)
+        
+        # Cache hits and misses, and their values at the last size review
+        self._cache_counts = CacheCounter()
+        self._tuned_counts = (0, 0)
         
         # Thread safety
         self._lock = threading.RLock()
@@ -246,8 +391,77 @@ class URLRouter:
         ]
         
         self.url_patterns.extend(patterns)
+        self._build_combined_pattern()
         self.logger.info(f"Initialized {len(patterns)} URL patterns")
     
+    def _build_combined_pattern(self):
+        """Fuse all URL patterns into one regex so a URL is searched once"""
+        patterns = list(self.url_patterns)
+        # Inner group names repeat across patterns, so only the outer
+        # '__pN' groups capture; the winning pattern extracts its own groups
+        alternatives = [
+            f'(?P<__p{i}>' + _NAMED_GROUP_RE.sub('(?:', p.pattern.pattern) + ')'
+            for i, p in enumerate(patterns)
+        ]
+        try:
+            self._combined_pattern = re.compile('|'.join(alternatives), re.IGNORECASE)
+        except re.error as e:
+            # e.g. custom patterns with inline global flags; search them one by one
+            self.logger.warning(f"Could not combine URL patterns: {e}")
+            self._combined_pattern = None
+        self._combined_patterns = patterns
+        self._hs_database = self._build_hyperscan_database(patterns)
+        
+        # URLs that contain none of the required domains can't match
+        required = set()
+        by_domain = DomainTrie()
+        for i, p in enumerate(patterns):
+            domains = _required_domains(p.pattern.pattern)
+            if domains is None:
+                required = by_domain = None
+                break
+            required.update(domains)
+            by_domain.insert_all(domains, str(i))
+        self._domain_prefilter = (
+            re.compile('|'.join(map(re.escape, sorted(required))), re.IGNORECASE)
+            if required else None
+        )
+        self._patterns_by_domain = by_domain if required else None
+    
+    def _build_hyperscan_database(self, patterns: List[URLPattern]):
+        """Compile patterns into a hyperscan database, or None if unavailable"""
+        if hyperscan is None or not patterns:
+            return None
+        
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                # Hyperscan doesn't report groups; re extracts them afterwards
+                expressions=[
+                    _NAMED_GROUP_RE.sub('(?:', p.pattern.pattern).encode('utf-8')
+                    for p in patterns
+                ],
+                ids=list(range(len(patterns))),
+                elements=len(patterns),
+                flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(patterns)
+            )
+            return database
+        except Exception as e:
+            self.logger.warning(f"Could not compile URL patterns with hyperscan: {e}")
+            return None
+    
+    def _scan_hyperscan(self, database, url: str) -> List[int]:
+        """Get the indices of all patterns matching a URL, in list order"""
+        matched = set()
+        
+        def on_match(pattern_id, start, end, flags, context):
+            matched.add(pattern_id)
+        
+        # The database's scratch space can't be shared by concurrent scans
+        with self._lock:
+            database.scan(url.encode('utf-8'), match_event_handler=on_match)
+        return sorted(matched)
+    
     def add_url_pattern(self, pattern: URLPattern):
         """
         Add a custom URL pattern.
@@ -257,6 +471,7 @@ class URLRouter:
         """
         with self._lock:
             self.url_patterns.append(pattern)
+            self._build_combined_pattern()
             # Clear cache as new pattern might affect routing
             self._routing_cache.clear()
     
@@ -270,15 +485,33 @@ class URLRouter:
         Returns:
             RoutingResult object
         """
+        # Cache hits skip the lock; single dict operations are atomic
+        cached = self._routing_cache.get(url)
+        if cached is not None:
+            try:
+                self._routing_cache.move_to_end(url)
+            except KeyError:
+                pass  # Evicted by a concurrent writer
+            self._cache_counts.hit()
+            return cached
+        
         with self._lock:
-            # Check cache first
-            if url in self._routing_cache:
-                return self._routing_cache[url]
+            # Check cache again, it may have been filled meanwhile
+            cached = self._routing_cache.get(url)
+            if cached is not None:
+                self._routing_cache.move_to_end(url)
+                self._cache_counts.hit()
+                return cached
+            
+            self._cache_counts.miss()
+            self._tune_cache_size()
             
             try:
-                # Analyze URL
-                url_info = self._analyze_url(url)
-                if not url_info:
+                # Check that the URL can be analyzed; the analysis itself is
+                # deferred until url_info is needed
+                try:
+                    parse_url(url)
+                except ValueError:
                     result = RoutingResult(
                         success=False,
                         error_message="Failed to analyze URL"
@@ -289,22 +522,19 @@ class URLRouter:
                 # Find appropriate plugin
                 plugin = self.registry.get_plugin_for_url(url)
                 if not plugin:
-                    result = RoutingResult(
+                    result = _LazyRoutingResult(
+                        self, url,
                         success=False,
-                        url_info=url_info,
                         error_message="No suitable plugin found"
                     )
                     self._cache_result(url, result)
                     return result
                 
-                # Calculate confidence score
-                confidence = self._calculate_confidence(url_info, plugin)
-                
-                result = RoutingResult(
+                # URL info and confidence score are computed on first access
+                result = _LazyRoutingResult(
+                    self, url,
                     success=True,
-                    plugin=plugin,
-                    url_info=url_info,
-                    confidence=confidence
+                    plugin=plugin
                 )
                 
                 self._cache_result(url, result)
@@ -329,12 +559,12 @@ class URLRouter:
         Returns:
             List of RoutingResult objects
         """
-        results = []
-        for url in urls:
-            result = self.route_url(url)
-            results.append(result)
+        # Route each distinct URL once; repeated URLs share the result
+        routed: Dict[str, Optional[RoutingResult]] = dict.fromkeys(urls)
+        for url in routed:
+            routed[url] = self.route_url(url)
         
-        return results
+        return [routed[url] for url in urls]
     
     def get_url_info(self, url: str) -> Optional[URLInfo]:
         """
@@ -390,7 +620,9 @@ class URLRouter:
         with self._lock:
             return {
                 'cache_size': len(self._routing_cache),
-                'cache_limit': self._cache_size_limit
+                'cache_limit': self._cache_size_limit,
+                'cache_hits': self._cache_counts.hits,
+                'cache_misses': self._cache_counts.misses
             }
     
     def _analyze_url(self, url: str) -> Optional[URLInfo]:
@@ -400,20 +632,58 @@ class URLRouter:
             if not url.startswith(('http://', 'https://')):
                 url = 'https://' + url
             
-            # Try each pattern
-            for pattern in self.url_patterns:
-                url_info = pattern.match(url)
-                if url_info:
-                    return url_info
+            if len(self._combined_patterns) != len(self.url_patterns):
+                # Patterns were appended to the list directly
+                self._build_combined_pattern()
+            
+            # Try the few patterns for the URL's host (or its parent domains)
+            by_domain = self._patterns_by_domain
+            if by_domain is not None:
+                host = parse_url(url).hostname
+                for index in sorted(map(int, by_domain.match(host))):
+                    url_info = self._combined_patterns[index].match(url)
+                    if url_info:
+                        return url_info
+            
+            # Other hosts may still carry a platform URL elsewhere (e.g. in a path)
+            combined = self._combined_pattern
+            prefilter = self._domain_prefilter
+            if prefilter is not None and not prefilter.search(url):
+                # No platform domain anywhere in the URL, so no pattern can match
+                combined = None
+                patterns = ()
+            else:
+                patterns = self.url_patterns
+            
+            hs_database = self._hs_database
+            if hs_database is not None and patterns:
+                # One DFA pass finds every matching pattern
+                for index in self._scan_hyperscan(hs_database, url):
+                    url_info = self._combined_patterns[index].match(url)
+                    if url_info:
+                        return url_info
+            elif combined is not None:
+                # One search finds the leftmost match of any pattern
+                match = combined.search(url)
+                if match:
+                    url_info = self._combined_patterns[int(match.lastgroup[3:])].match(url)
+                    if url_info:
+                        return url_info
+            else:
+                # Try each pattern
+                for pattern in patterns:
+                    url_info = pattern.match(url)
+                    if url_info:
+                        return url_info
             
             # If no pattern matches, create basic URL info
-            parsed = urlparse(url)
+            parsed = parse_url(url)
             return URLInfo(
                 url=url,
-                domain=parsed.netloc.lower(),
+                domain=parsed.netloc,
                 url_type=URLType.UNKNOWN,
                 platform='unknown',
-                parameters=dict(parse_qs(parsed.query))
+                parameters={k: list(v) for k, v in parsed.query_params.items()}
             )
             
         except Exception as e:
@@ -422,32 +692,38 @@ class URLRouter:
     
     def _calculate_confidence(self, url_info: URLInfo, plugin: RegisteredPlugin) -> float:
         """Calculate confidence score for plugin selection"""
-        confidence = 0.5  # Base confidence
-        
-        # Boost confidence if platform matches
-        if url_info.platform in plugin.name.lower():
-            confidence += 0.3
-        
-        # Boost confidence if domain is directly supported
-        if any(domain in url_info.domain for domain in plugin.supported_domains):
-            confidence += 0.2
-        
-        # Boost confidence based on plugin usage
-        if plugin.usage_count > 0:
-            confidence += min(0.1, plugin.usage_count / 100)
-        
-        # Boost confidence based on plugin priority
-        if plugin.priority > 0:
-            confidence += min(0.1, plugin.priority / 10)
-        
+        confidence = (
+            0.5  # Base confidence
+            # Boost confidence if platform matches
+            + (0.3 if plugin.name_contains(url_info.platform) else 0.0)
+            # Boost confidence if domain is directly supported
+            + (0.2 if plugin.domain_in(url_info.domain) else 0.0)
+            # Boost confidence based on plugin usage and priority
+            + min(0.1, max(0, plugin.usage_count) / 100)
+            + min(0.1, max(0, plugin.priority) / 10)
+        )
         return min(1.0, confidence)
     
-    def _cache_result(self, url: str, result: RoutingResult):
-        """Cache routing result"""
-        if len(self._routing_cache) >= self._cache_size_limit:
-            # Remove oldest entries (simple FIFO)
-            oldest_keys = list(self._routing_cache.keys())[:100]
-            for key in oldest_keys:
-                del self._routing_cache[key]
+    def _tune_cache_size(self):
+        """Grow a full routing cache whose recent hit ratio is low"""
+        counts = self._cache_counts
+        hits, misses = counts.hits, counts.misses
+        last_hits, last_misses = self._tuned_counts
+        window_hits = hits - last_hits
+        lookups = window_hits + misses - last_misses
+        if lookups < _CACHE_TUNE_INTERVAL:
+            return
         
-        self._routing_cache[url] = result
\ No newline at end of file
+        self._tuned_counts = (hits, misses)
+        if (window_hits / lookups < _CACHE_GROW_HIT_RATIO
+                and len(self._routing_cache) >= self._cache_size_limit
+                and self._cache_size_limit < self._max_cache_size):
+            self._cache_size_limit = min(self._cache_size_limit * 2, self._max_cache_size)
+            self.logger.debug(f"Routing cache limit raised to {self._cache_size_limit}")
+    
+    def _cache_result(self, url: str, result: RoutingResult):
+        """Cache routing result, evicting the least recently used entries"""
+        self._routing_cache[url] = result
+        self._routing_cache.move_to_end(url)
+        while len(self._routing_cache) > self._cache_size_limit:
+            self._routing_cache.popitem(last=False)
\ No newline at end of file
@@ -2,17 +2,41 @@
 Security manager for plugin isolation and safety.
 """
 import ast
+import asyncio
 import logging
+import re
 import sys
 import threading
 import time
-from typing import Set, List, Dict, Any, Optional, Callable
+from typing import Set, List, Dict, Any, Optional, Callable, Awaitable, NamedTuple, Pattern, Tuple
 from pathlib import Path
 import importlib.util
 from dataclasses import dataclass
 from enum import Enum
 import hashlib
+import io
 import json
+import tokenize
+
+
+# Attribute names that expose interpreter internals
+DANGEROUS_ATTRIBUTES = frozenset({'__import__', '__builtins__', '__globals__', '__locals__'})
+
+
+def _source_encoding(data: bytes) -> str:
+    """Get the encoding the parser will use for a source (PEP 263 cookie or BOM)"""
+    return tokenize.detect_encoding(io.BytesIO(data).readline)[0]
+
+
+def _sha256_file(f) -> str:
+    """Hash an open binary file without reading it into memory at once"""
+    if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+        return hashlib.file_digest(f, 'sha256').hexdigest()
+    
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: f.read(65536), b''):
+        digest.update(chunk)
+    return digest.hexdigest()
 
 
 class SecurityLevel(Enum):
@@ -114,6 +138,14 @@ class SecurityPolicy:
         }
 
 
+class _PolicyKey(NamedTuple):
+    """Frozen copy of the policy settings that validation depends on"""
+    level: SecurityLevel
+    allowed_imports: frozenset
+    blocked_imports: frozenset
+    blocked_functions: frozenset
+
+
 class PluginSecurityManager:
     """
     Security manager for plugin isolation and safety checks.
@@ -125,11 +157,18 @@ class PluginSecurityManager:
         
         # Security state
         self._plugin_checksums: Dict[str, str] = {}
+        # plugin name -> (checksum, policy key, violations) of the last validation
+        self._validation_cache: Dict[str, Tuple[str, _PolicyKey, List[SecurityViolation]]] = {}
+        self._stat_cache: Dict[str, Tuple[str, int, int]] = {}  # plugin name -> (path, mtime_ns, size)
         self._violation_history: Dict[str, List[SecurityViolation]] = {}
+        self._violation_count = 0  # Total across all plugins
         
         # Thread safety
         self._lock = threading.RLock()
         
+        # Compiled pattern of every blocked name, keyed by the names it was built from
+        self._token_pattern: Optional[Tuple[Tuple[frozenset, frozenset], Pattern]] = None
+        
         # Load security configuration
         self._load_security_config()
     
@@ -171,50 +210,86 @@ class PluginSecurityManager:
         Returns:
             List of security violations found
         """
-        with self._lock:
-            violations = []
+        violations = []
+        
+        try:
+            # Read and parse the file outside the lock so plugins can be
+            # validated concurrently from worker threads. The raw bytes are
+            # hashed, pre-scanned and parsed directly; the source is only
+            # decoded when the AST walk needs code snippets.
+            plugin_name = plugin_path.stem
+            policy_key = self._policy_key()
+            stat = plugin_path.stat()
+            stat_key = (str(plugin_path), stat.st_mtime_ns, stat.st_size)
             
-            try:
-                # Read and parse the file
-                content = plugin_path.read_text(encoding='utf-8')
-                tree = ast.parse(content, filename=str(plugin_path))
-                
-                # Calculate checksum
-                checksum = hashlib.sha256(content.encode()).hexdigest()
-                plugin_name = plugin_path.stem
+            cached = self._validation_cache.get(plugin_name)
+            if cached is not None and cached[1] != policy_key:
+                cached = None
+            
+            if cached is not None and self._stat_cache.get(plugin_name) == stat_key:
+                # Untouched since the last validation; skip opening the file
+                checksum = cached[0]
+                data = None
+            else:
+                with plugin_path.open('rb') as f:
+                    # Calculate checksum, streaming the file
+                    checksum = _sha256_file(f)
+                    if cached is not None and cached[0] == checksum:
+                        # Unchanged content under an unchanged policy
+                        data = None
+                    else:
+                        f.seek(0)
+                        data = f.read()
+            
+            if data is None:
+                violations.extend(cached[2])
+            else:
+                # Key the result by exactly the bytes analyzed, in case the
+                # file changed after it was hashed
+                checksum = hashlib.sha256(data).hexdigest()
+                tree = ast.parse(data, filename=str(plugin_path))
                 
+                # Perform AST-based security analysis, unless a single regex
+                # pass shows that no blocked name occurs in the source
+                encoding = _source_encoding(data)
+                if self._may_violate(data, encoding, policy_key):
+                    content = data.decode(encoding, errors='replace').replace('\r\n', '\n')
+                    violations.extend(self._analyze_ast(tree, content, policy_key))
+            
+            with self._lock:
                 # Check if file has been modified
                 if plugin_name in self._plugin_checksums:
                     if self._plugin_checksums[plugin_name] != checksum:
                         self.logger.info(f"Plugin {plugin_name} has been modified")
                 
                 self._plugin_checksums[plugin_name] = checksum
-                
-                # Perform AST-based security analysis
-                violations.extend(self._analyze_ast(tree, content))
+                self._validation_cache[plugin_name] = (checksum, policy_key, list(violations))
+                self._stat_cache[plugin_name] = stat_key
                 
                 # Store violations
+                previous = self._violation_history.get(plugin_name, ())
+                self._violation_count += len(violations) - len(previous)
                 self._violation_history[plugin_name] = violations
-                
-                return violations
-                
-            except SyntaxError as e:
-                violations.append(SecurityViolation(
-                    violation_type=ViolationType.EXECUTION,
-                    description=f"Syntax error in plugin: {e}",
-                    line_number=e.lineno,
-                    severity="high"
-                ))
-                return violations
-                
-            except Exception as e:
-                self.logger.error(f"Error validating plugin {plugin_path}: {e}")
-                violations.append(SecurityViolation(
-                    violation_type=ViolationType.EXECUTION,
-                    description=f"Validation error: {e}",
-                    severity="medium"
-                ))
-                return violations
+            
+            return violations
+            
+        except SyntaxError as e:
+            violations.append(SecurityViolation(
+                violation_type=ViolationType.EXECUTION,
+                description=f"Syntax error in plugin: {e}",
+                line_number=e.lineno,
+                severity="high"
+            ))
+            return violations
+            
+        except Exception as e:
+            self.logger.error(f"Error validating plugin {plugin_path}: {e}")
+            violations.append(SecurityViolation(
+                violation_type=ViolationType.EXECUTION,
+                description=f"Validation error: {e}",
+                severity="medium"
+            ))
+            return violations
     
     def is_plugin_safe(self, plugin_path: Path) -> bool:
         """
@@ -315,6 +390,52 @@ class PluginSecurityManager:
             self._record_violation(plugin_name, violation)
             raise
     
+    async def monitor_plugin_execution_async(self, plugin_name: str,
+                                             awaitable: Awaitable) -> Any:
+        """
+        Monitor asynchronous plugin execution for security violations.
+        
+        The awaitable runs on the caller's event loop, so no extra loop or
+        thread is needed per call.
+        
+        Args:
+            plugin_name: Name of the plugin
+            awaitable: Coroutine or future to await
+            
+        Returns:
+            Result of execution
+            
+        Raises:
+            SecurityError: If security violation detected
+        """
+        start_time = time.time()
+        
+        try:
+            result = await asyncio.wait_for(awaitable, self.policy.max_execution_time)
+            
+            execution_time = time.time() - start_time
+            self.logger.debug(f"Plugin {plugin_name} executed in {execution_time:.2f}s")
+            
+            return result
+            
+        except asyncio.TimeoutError:
+            violation = SecurityViolation(
+                violation_type=ViolationType.EXECUTION,
+                description=f"Plugin execution timeout ({self.policy.max_execution_time}s)",
+                severity="high"
+            )
+            self._record_violation(plugin_name, violation)
+            raise SecurityError(f"Plugin {plugin_name} execution timeout")
+        
+        except Exception as e:
+            violation = SecurityViolation(
+                violation_type=ViolationType.EXECUTION,
+                description=f"Plugin execution error: {e}",
+                severity="medium"
+            )
+            self._record_violation(plugin_name, violation)
+            raise
+    
     def get_plugin_violations(self, plugin_name: str) -> List[SecurityViolation]:
         """
         Get security violations for a plugin.
@@ -338,6 +459,15 @@ class PluginSecurityManager:
         with self._lock:
             return self._violation_history.copy()
     
+    def get_total_violation_count(self) -> int:
+        """
+        Get the number of recorded violations across all plugins.
+        
+        Returns:
+            Total violation count
+        """
+        return self._violation_count
+    
     def clear_violations(self, plugin_name: Optional[str] = None):
         """
         Clear security violations.
@@ -347,9 +477,10 @@ class PluginSecurityManager:
         """
         with self._lock:
             if plugin_name:
-                self._violation_history.pop(plugin_name, None)
+                self._violation_count -= len(self._violation_history.pop(plugin_name, ()))
             else:
                 self._violation_history.clear()
+                self._violation_count = 0
     
     def update_policy(self, policy: SecurityPolicy):
         """
@@ -362,111 +493,57 @@ class PluginSecurityManager:
             self.policy = policy
             self.logger.info(f"Security policy updated to {policy.level.value}")
     
-    def _analyze_ast(self, tree: ast.AST, content: str) -> List[SecurityViolation]:
-        """Analyze AST for security violations"""
-        violations = []
-        lines = content.split('\n')
-        
-        for node in ast.walk(tree):
-            # Check imports
-            if isinstance(node, (ast.Import, ast.ImportFrom)):
-                violations.extend(self._check_import_node(node, lines))
-            
-            # Check function calls
-            elif isinstance(node, ast.Call):
-                violations.extend(self._check_call_node(node, lines))
-            
-            # Check attribute access
-            elif isinstance(node, ast.Attribute):
-                violations.extend(self._check_attribute_node(node, lines))
-        
-        return violations
-    
-    def _check_import_node(self, node: ast.AST, lines: List[str]) -> List[SecurityViolation]:
-        """Check import node for violations"""
-        violations = []
-        
-        if isinstance(node, ast.Import):
-            for alias in node.names:
-                module_name = alias.name
-                if self._is_blocked_import(module_name):
-                    violations.append(SecurityViolation(
-                        violation_type=ViolationType.DANGEROUS_IMPORT,
-                        description=f"Blocked import: {module_name}",
-                        line_number=node.lineno,
-                        code_snippet=lines[node.lineno - 1] if node.lineno <= len(lines) else None,
-                        severity="high"
-                    ))
-        
-        elif isinstance(node, ast.ImportFrom):
-            module_name = node.module or ''
-            if self._is_blocked_import(module_name):
-                violations.append(SecurityViolation(
-                    violation_type=ViolationType.DANGEROUS_IMPORT,
-                    description=f"Blocked import from: {module_name}",
-                    line_number=node.lineno,
-                    code_snippet=lines[node.lineno - 1] if node.lineno <= len(lines) else None,
-                    severity="high"
-                ))
+    def _policy_key(self) -> _PolicyKey:
+        """
+        Snapshot the policy settings that validation results depend on.
         
-        return violations
+        Taken once per validation, since the policy's sets may be modified
+        in place between validations.
+        """
+        policy = self.policy
+        return _PolicyKey(
+            level=policy.level,
+            allowed_imports=frozenset(policy.allowed_imports),
+            blocked_imports=frozenset(policy.blocked_imports),
+            blocked_functions=frozenset(policy.blocked_functions),
+        )
     
-    def _check_call_node(self, node: ast.Call, lines: List[str]) -> List[SecurityViolation]:
-        """Check function call node for violations"""
-        violations = []
-        
-        # Get function name
-        func_name = None
-        if isinstance(node.func, ast.Name):
-            func_name = node.func.id
-        elif isinstance(node.func, ast.Attribute):
-            func_name = node.func.attr
-        
-        if func_name and func_name in self.policy.blocked_functions:
-            violations.append(SecurityViolation(
-                violation_type=ViolationType.DANGEROUS_FUNCTION,
-                description=f"Blocked function call: {func_name}",
-                line_number=node.lineno,
-                code_snippet=lines[node.lineno - 1] if node.lineno <= len(lines) else None,
-                severity="high"
-            ))
-        
-        return violations
+    def _may_violate(self, content: bytes, encoding: str, policy_key: _PolicyKey) -> bool:
+        """
+        Check whether the source mentions any blocked name.
+        
+        All blocked imports, functions and attributes are matched in one
+        pass with a compiled alternation over the raw bytes. Strict mode
+        blocks every import outside the allow list, non-ASCII identifiers
+        are normalized by the parser, and a coding cookie other than UTF-8
+        (e.g. utf-7) can spell names differently in the raw bytes, so all
+        of these always fall back to the full AST analysis.
+        """
+        if (policy_key.level == SecurityLevel.STRICT or not content.isascii()
+                or encoding not in ('utf-8', 'utf-8-sig')):
+            return True
+        return self._get_token_pattern(policy_key).search(content) is not None
     
-    def _check_attribute_node(self, node: ast.Attribute, lines: List[str]) -> List[SecurityViolation]:
-        """Check attribute access node for violations"""
-        violations = []
-        
-        # Check for dangerous attribute access
-        dangerous_attrs = ['__import__', '__builtins__', '__globals__', '__locals__']
-        
-        if node.attr in dangerous_attrs:
-            violations.append(SecurityViolation(
-                violation_type=ViolationType.SYSTEM_ACCESS,
-                description=f"Dangerous attribute access: {node.attr}",
-                line_number=node.lineno,
-                code_snippet=lines[node.lineno - 1] if node.lineno <= len(lines) else None,
-                severity="critical"
-            ))
-        
-        return violations
+    def _get_token_pattern(self, policy_key: _PolicyKey) -> Pattern:
+        """Get the blocked-name pattern, rebuilding it if the policy changed"""
+        key = (policy_key.blocked_imports, policy_key.blocked_functions)
+        cached = self._token_pattern
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        # Longest names first so prefixes don't shadow them
+        names = sorted(key[0] | key[1] | DANGEROUS_ATTRIBUTES, key=len, reverse=True)
+        alternation = '|'.join(map(re.escape, names)).encode('utf-8')
+        pattern = re.compile(rb'\b(?:' + alternation + rb')\b')
+        self._token_pattern = (key, pattern)
+        return pattern
     
-    def _is_blocked_import(self, module_name: str) -> bool:
-        """Check if import is blocked"""
-        # Check exact matches
-        if module_name in self.policy.blocked_imports:
-            return True
-        
-        # Check if it's not in allowed imports (for strict mode)
-        if self.policy.level == SecurityLevel.STRICT:
-            if module_name not in self.policy.allowed_imports:
-                # Check for partial matches
-                allowed = any(module_name.startswith(allowed + '.') 
-                            for allowed in self.policy.allowed_imports)
-                if not allowed:
-                    return True
-        
-        return False
+    def _analyze_ast(self, tree: ast.AST, content: str,
+                     policy_key: _PolicyKey) -> List[SecurityViolation]:
+        """Analyze AST for security violations"""
+        visitor = _SecurityVisitor(policy_key, content)
+        visitor.visit(tree)
+        return visitor.violations
     
     def _execute_with_timeout(self, func: Callable, timeout: float) -> Any:
         """Execute function with timeout"""
@@ -518,9 +595,114 @@ class PluginSecurityManager:
                 self._violation_history[plugin_name] = []
             
             self._violation_history[plugin_name].append(violation)
+            self._violation_count += 1
             self.logger.warning(f"Security violation in {plugin_name}: {violation.description}")
 
 
+class _SecurityVisitor:
+    """
+    Collects the security violations of a module in a single AST walk.
+    
+    Nodes are dispatched by type with one dict lookup, and every check
+    appends straight to self.violations.
+    """
+    
+    __slots__ = ('blocked_imports', 'blocked_functions', 'allowed_imports',
+                 'allowed_prefixes', 'strict', 'content', 'violations', '_lines',
+                 '_dispatch')
+    
+    def __init__(self, policy_key: _PolicyKey, content: str):
+        self.blocked_imports = policy_key.blocked_imports
+        self.blocked_functions = policy_key.blocked_functions
+        self.allowed_imports = policy_key.allowed_imports
+        # Submodules of allowed packages are allowed too
+        self.allowed_prefixes = tuple(name + '.' for name in policy_key.allowed_imports)
+        self.strict = policy_key.level == SecurityLevel.STRICT
+        self.content = content
+        self.violations: List[SecurityViolation] = []
+        self._lines: Optional[List[str]] = None  # Split on the first violation
+        self._dispatch = {
+            ast.Import: self.visit_Import,
+            ast.ImportFrom: self.visit_ImportFrom,
+            ast.Call: self.visit_Call,
+            ast.Attribute: self.visit_Attribute,
+        }
+    
+    def visit(self, tree: ast.AST):
+        """Check every node of a tree"""
+        dispatch = self._dispatch
+        for node in ast.walk(tree):
+            visit = dispatch.get(type(node))
+            if visit is not None:
+                visit(node)
+    
+    def visit_Import(self, node: ast.Import):
+        """Check import node for violations"""
+        for alias in node.names:
+            module_name = alias.name
+            if self._is_blocked_import(module_name):
+                self._add(node, ViolationType.DANGEROUS_IMPORT,
+                          f"Blocked import: {module_name}", "high")
+    
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        """Check from-import node for violations"""
+        module_name = node.module or ''
+        if self._is_blocked_import(module_name):
+            self._add(node, ViolationType.DANGEROUS_IMPORT,
+                      f"Blocked import from: {module_name}", "high")
+    
+    def visit_Call(self, node: ast.Call):
+        """Check function call node for violations"""
+        # Get function name
+        func = node.func
+        if isinstance(func, ast.Name):
+            func_name = func.id
+        elif isinstance(func, ast.Attribute):
+            func_name = func.attr
+        else:
+            return
+        
+        if func_name in self.blocked_functions:
+            self._add(node, ViolationType.DANGEROUS_FUNCTION,
+                      f"Blocked function call: {func_name}", "high")
+    
+    def visit_Attribute(self, node: ast.Attribute):
+        """Check attribute access node for violations"""
+        # Check for dangerous attribute access
+        if node.attr in DANGEROUS_ATTRIBUTES:
+            self._add(node, ViolationType.SYSTEM_ACCESS,
+                      f"Dangerous attribute access: {node.attr}", "critical")
+    
+    def _is_blocked_import(self, module_name: str) -> bool:
+        """Check if import is blocked"""
+        # Check exact matches
+        if module_name in self.blocked_imports:
+            return True
+        
+        # Check if it's not in allowed imports (for strict mode)
+        return (self.strict
+                and module_name not in self.allowed_imports
+                and not module_name.startswith(self.allowed_prefixes))
+    
+    def _add(self, node: ast.AST, violation_type: ViolationType,
+             description: str, severity: str):
+        """Record a violation at a node's line"""
+        self.violations.append(SecurityViolation(
+            violation_type=violation_type,
+            description=description,
+            line_number=node.lineno,
+            code_snippet=self._snippet(node.lineno),
+            severity=severity
+        ))
+    
+    def _snippet(self, lineno: int) -> Optional[str]:
+        """Get a source line, splitting the source only once it's needed"""
+        lines = self._lines
+        if lines is None:
+            lines = self._lines = self.content.split('\n')
+        return lines[lineno - 1] if lineno <= len(lines) else None
+
+
 class SecurityError(Exception):
     """Security-related exception"""
     pass
\ No newline at end of file
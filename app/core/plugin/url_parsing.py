@@ -0,0 +1,43 @@
+"""
+Cached URL parsing shared by the plugin registry, router and manager.
+"""
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple
+from urllib.parse import urlparse, parse_qs
+
+
+class ParsedURL(NamedTuple):
+    """Parts of a URL needed for routing"""
+    netloc: str  # Lower-cased network location
+    hostname: str  # Host name without port or credentials, '' if missing
+    query_params: Mapping[str, List[str]]  # Shared between callers, don't modify
+
+
+# Query parameters of URLs without a query string
+_NO_QUERY: Mapping[str, List[str]] = MappingProxyType({})
+
+
+@lru_cache(maxsize=4096)
+def parse_url(url: str) -> ParsedURL:
+    """
+    Parse a URL once for all routing stages.
+    
+    Args:
+        url: URL to parse
+    
+    Returns:
+        ParsedURL with the lower-cased, interned netloc and host name and the
+        query parameters
+    
+    Raises:
+        ValueError: If the URL can't be parsed
+    """
+    parsed = urlparse(url)
+    return ParsedURL(
+        # Hosts repeat across URLs; interned strings hash and compare faster
+        netloc=sys.intern(parsed.netloc.lower()),
+        hostname=sys.intern(parsed.hostname or ''),
+        query_params=parse_qs(parsed.query) if parsed.query else _NO_QUERY
+    )
@@ -16,14 +16,7 @@ class ExampleExtractor(BaseExtractor):
     This extractor handles example.com URLs.
     """
     
-    @property
-    def supported_domains(self) -> List[str]:
-        return ['example.com', 'www.example.com']
-    
-    def can_handle(self, url: str) -> bool:
-        """Check if this extractor can handle the given URL"""
-        domain = self._extract_domain(url)
-        return any(supported in domain for supported in self.supported_domains)
+    SUPPORTED_DOMAINS = ('example.com', 'www.example.com')
     
     async def extract_info(self, url: str) -> Dict[str, Any]:
         """Extract information from the URL"""
@@ -10,7 +10,7 @@ from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
 from app.core.downloader.advanced_downloader import AdvancedDownloader, ProxyConfig
-from app.core.downloader.rate_limiter import TokenBucketRateLimiter, AdaptiveRateLimiter
+from app.core.downloader.rate_limiter import TokenBucketRateLimiter, AdaptiveRateLimiter, BandwidthMonitor
 from app.core.downloader.m3u8_parser import M3U8Parser, M3U8Playlist, M3U8Segment
 from app.data.models.core import DownloadOptions, DownloadResult
 
@@ -58,6 +58,87 @@ class TestTokenBucketRateLimiter:
         
         # Rate should have decreased
         assert limiter.rate < limiter.max_rate
+    
+    def test_created_outside_event_loop(self):
+        """Test a limiter built before the loop that later waits in it"""
+        limiter = TokenBucketRateLimiter(rate=10000, capacity=1000)
+        limiter.set_rate(10000)
+        
+        async def download():
+            await limiter.acquire(1000)
+            # Empty bucket, this has to wait on the condition
+            await limiter.acquire(500)
+        
+        asyncio.run(download())
+        assert limiter.tokens < 1000
+    
+    def test_set_rate_rescales_tokens(self):
+        """Test that changing the rate scales the fill level with it"""
+        limiter = TokenBucketRateLimiter(rate=1000, capacity=2000)
+        limiter.tokens = 1000
+        
+        # Freeze the clock so no tokens are refilled in between
+        with patch('app.core.downloader.rate_limiter.time.monotonic', return_value=limiter.last_update):
+            limiter.set_rate(500)
+            assert limiter.capacity == 1000
+            assert limiter.tokens == pytest.approx(500)
+            
+            limiter.set_rate(4000)
+            assert limiter.capacity == 8000
+            assert limiter.tokens == pytest.approx(4000)
+            
+            # A full bucket stays full, and never exceeds the new capacity
+            limiter.tokens = limiter.capacity
+            limiter.set_rate(2000)
+            assert limiter.tokens == pytest.approx(4000)
+
+
+class TestBandwidthMonitor:
+    """Test bandwidth monitor batching"""
+    
+    def test_small_transfers_are_batched(self):
+        """Test that small transfers are merged into one sample"""
+        monitor = BandwidthMonitor(window_size=60)
+        start = monitor._pending_since
+        
+        for i in range(10):
+            monitor.record_transfer(1000, now=start + i * 0.001)
+        assert len(monitor.data_points) == 0
+        
+        # The flush interval has passed, so everything becomes one sample
+        monitor.record_transfer(1000, now=start + monitor.FLUSH_INTERVAL)
+        assert list(monitor.data_points) == [(start + monitor.FLUSH_INTERVAL, 11000)]
+    
+    def test_large_transfer_flushes_immediately(self):
+        """Test that reaching the byte threshold flushes at once"""
+        monitor = BandwidthMonitor(window_size=60)
+        start = monitor._pending_since
+        
+        monitor.record_transfer(monitor.FLUSH_THRESHOLD, now=start + 0.001)
+        assert list(monitor.data_points) == [(start + 0.001, monitor.FLUSH_THRESHOLD)]
+    
+    def test_pending_bytes_are_counted(self):
+        """Test that reads include transfers that have not been flushed yet"""
+        monitor = BandwidthMonitor(window_size=60)
+        start = monitor._pending_since
+        
+        monitor.record_transfer(monitor.FLUSH_THRESHOLD, now=start + 1.0)
+        monitor.record_transfer(1000, now=start + 1.001)
+        
+        assert monitor.get_current_bandwidth(now=start + 2.0) == pytest.approx(
+            (monitor.FLUSH_THRESHOLD + 1000) / 1.0
+        )
+        assert monitor.get_stats()['data_points'] == 2
+    
+    def test_old_samples_leave_the_window(self):
+        """Test that samples older than the window are dropped on flush"""
+        monitor = BandwidthMonitor(window_size=1)
+        start = monitor._pending_since
+        
+        monitor.record_transfer(monitor.FLUSH_THRESHOLD, now=start + 0.1)
+        monitor.record_transfer(monitor.FLUSH_THRESHOLD, now=start + 5.0)
+        
+        assert len(monitor.data_points) == 1
 
 
 class TestM3U8Parser:
@@ -13,8 +13,9 @@ from app.core.plugin import (
     PluginSecurityManager, SecurityPolicy, SecurityLevel
 )
 from app.core.plugin.loader import PluginLoadResult
+from app.core.plugin.domain_trie import DomainTrie
 from app.core.plugin.registry import PluginStatus
-from app.core.plugin.router import URLType
+from app.core.plugin.router import URLType, URLPattern
 from app.core.extractor.base import BaseExtractor, ExtractorInfo
 
 
@@ -122,6 +123,39 @@ class TestExtractor(BaseExtractor):
         result2 = self.loader.reload_plugin('test_plugin')
         assert result2.success
         assert result2.plugin_name == 'test_plugin'
+    
+    def test_scan_all_plugins(self):
+        """Test reading plugin domains without importing the plugin"""
+        manifests = self.loader.scan_all_plugins()
+        
+        assert manifests == {'test_plugin': ('test.com',)}
+        assert 'test_plugin' not in self.loader.loaded_plugins
+
+
+class TestDomainTrie:
+    """Test reverse-domain trie"""
+    
+    def test_match_subdomains(self):
+        """Test that domains match themselves and their subdomains"""
+        trie = DomainTrie()
+        trie.insert('youtube.com', 'youtube')
+        trie.insert('music.youtube.com', 'music')
+        
+        assert trie.match('youtube.com') == ['youtube']
+        assert trie.match('www.youtube.com') == ['youtube']
+        assert trie.match('music.youtube.com') == ['music', 'youtube']
+        assert trie.match('notyoutube.com') == []
+    
+    def test_remove(self):
+        """Test removing domains"""
+        trie = DomainTrie()
+        trie.insert('youtube.com', 'youtube')
+        trie.insert('youtu.be', 'youtube')
+        
+        trie.remove('youtube.com', 'youtube')
+        assert trie.match('youtube.com') == []
+        assert trie.match('youtu.be') == ['youtube']
+        assert len(trie) == 1
 
 
 class TestPluginRegistry:
@@ -179,6 +213,15 @@ class TestPluginRegistry:
         assert len(plugins) == 1
         assert plugins[0].name == 'test_plugin'
     
+    def test_get_plugins_for_subdomain(self):
+        """Test that registered domains also match their subdomains"""
+        self.registry.register_plugin('test_plugin', self.mock_extractor_class, self.test_info)
+        
+        plugins = self.registry.get_plugins_for_domain('www.test.com')
+        assert [p.name for p in plugins] == ['test_plugin']
+        assert self.registry.get_plugins_for_domain('nottest.com') == []
+        assert self.registry.get_supported_domains() == {'test.com'}
+    
     def test_get_plugin_for_url(self):
         """Test getting plugin for URL"""
         self.registry.register_plugin('test_plugin', self.mock_extractor_class, self.test_info)
@@ -186,6 +229,24 @@ class TestPluginRegistry:
         plugin = self.registry.get_plugin_for_url('https://test.com/video')
         assert plugin is not None
         assert plugin.name == 'test_plugin'
+    
+    def test_frozen_registry(self):
+        """Test lookups on a frozen registry and registration while frozen"""
+        self.registry.register_plugin('test_plugin', self.mock_extractor_class, self.test_info)
+        self.registry.freeze()
+        assert self.registry.is_frozen
+        
+        plugin = self.registry.get_plugin_for_url('https://test.com/video')
+        assert plugin is not None
+        assert plugin.name == 'test_plugin'
+        
+        # Changes while frozen are picked up by the rebuilt snapshot
+        self.registry.unregister_plugin('test_plugin')
+        assert self.registry.get_plugin_for_url('https://test.com/video') is None
+        assert self.registry.get_plugins_for_domain('test.com') == []
+        
+        self.registry.unfreeze()
+        assert not self.registry.is_frozen
 
 
 class TestURLRouter:
@@ -259,6 +320,27 @@ class TestURLRouter:
         
         assert self.router.is_supported_url(supported_url)
         assert not self.router.is_supported_url(unsupported_url)
+    
+    def test_custom_pattern_with_top_level_alternation(self):
+        """Test that both alternatives of a custom pattern are routed"""
+        self.router.add_url_pattern(URLPattern(
+            r'(?:https?://)?(?:www\.)?vimeo\.com/(?P<video_id>\d+)|player\.vimeocdn\.net/video/(?P<embed_id>\d+)',
+            URLType.VIDEO, 'vimeo', video_id_group='video_id'
+        ))
+        
+        assert self.router.get_url_info('https://vimeo.com/123').platform == 'vimeo'
+        assert self.router.get_url_info('https://player.vimeocdn.net/video/456').platform == 'vimeo'
+    
+    def test_custom_pattern_with_optional_domain_character(self):
+        """Test that a quantified domain literal still matches its variants"""
+        self.router.add_url_pattern(URLPattern(
+            r'(?:https?://)?(?:www\.)?dailymotion\.com?/video/(?P<video_id>\w+)',
+            URLType.VIDEO, 'dailymotion', video_id_group='video_id'
+        ))
+        
+        url_info = self.router.get_url_info('https://dailymotion.co/video/abc')
+        assert url_info.platform == 'dailymotion'
+        assert url_info.video_id == 'abc'
 
 
 class TestPluginSecurityManager:
@@ -331,6 +413,38 @@ class SafeExtractor(BaseExtractor):
         plugin_file.write_text(safe_plugin_content)
         
         assert self.security_manager.is_plugin_safe(plugin_file)
+    
+    def test_validation_cache(self):
+        """Test that cached results follow file and policy changes"""
+        plugin_file = self.temp_dir / 'cached_plugin.py'
+        plugin_file.write_text('import json\nvalue = eval("1")\n')
+        
+        first = self.security_manager.validate_plugin_file(plugin_file)
+        assert [v.description for v in first] == ['Blocked function call: eval']
+        assert self.security_manager.validate_plugin_file(plugin_file) == first
+        
+        # Changed content is analyzed again
+        plugin_file.write_text('import json\n')
+        assert self.security_manager.validate_plugin_file(plugin_file) == []
+        
+        # So is unchanged content under a changed policy
+        self.security_manager.policy.blocked_imports.add('json')
+        violations = self.security_manager.validate_plugin_file(plugin_file)
+        assert [v.description for v in violations] == ['Blocked import: json']
+    
+    def test_validate_coding_cookie_plugin(self):
+        """Test that names hidden by a non-UTF-8 coding cookie are found"""
+        plugin_file = self.temp_dir / 'utf7_plugin.py'
+        plugin_file.write_bytes(
+            b'# -*- coding: utf-7 -*-\n'
+            b'import +AG8-s\n'
+            b'x = +AGU-val("2")\n'
+        )
+        
+        violations = self.security_manager.validate_plugin_file(plugin_file)
+        descriptions = [v.description for v in violations]
+        assert 'Blocked import: os' in descriptions
+        assert 'Blocked function call: eval' in descriptions
 
 
 class TestPluginManager:
@@ -406,6 +520,16 @@ class TestExtractor(BaseExtractor):
         plugins = self.manager.get_all_plugins()
         assert 'test_plugin' in plugins
     
+    @pytest.mark.asyncio
+    async def test_concurrent_initialize(self):
+        """Test that concurrent initialization loads plugins only once"""
+        with patch.object(self.manager.loader, 'load_all_plugins',
+                          wraps=self.manager.loader.load_all_plugins) as load_all:
+            results = await asyncio.gather(self.manager.initialize(), self.manager.initialize())
+        
+        assert results == [True, True]
+        assert load_all.call_count == 1
+    
     @pytest.mark.asyncio
     async def test_load_plugin(self):
         """Test loading a specific plugin"""
@@ -0,0 +1,73 @@
+"""
+Tests for task queue callbacks.
+"""
+import gc
+
+import pytest
+
+from app.core.downloader.task_queue import TaskQueue
+from tests.utils.test_helpers import TestDataFactory
+
+
+class _Listener:
+    """Object whose bound method is registered as a queue callback"""
+    
+    def __init__(self):
+        self.statuses = []
+    
+    def on_queue_changed(self, status):
+        self.statuses.append(status)
+
+
+class TestTaskQueueCallbacks:
+    """Test weakly held queue callbacks"""
+    
+    @pytest.fixture
+    def task_queue(self):
+        """Create task queue instance"""
+        return TaskQueue(max_concurrent=3)
+    
+    @pytest.mark.asyncio
+    async def test_callback_is_called(self, task_queue):
+        """Test that a live listener is notified of changes"""
+        listener = _Listener()
+        task_queue.add_queue_callback(listener.on_queue_changed)
+        
+        await task_queue.add_task(TestDataFactory.create_download_task())
+        
+        assert len(listener.statuses) == 1
+        assert listener.statuses[0]['queued_count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_collected_listener_is_dropped(self, task_queue):
+        """Test that callbacks of collected owners are removed"""
+        listener = _Listener()
+        task_queue.add_queue_callback(listener.on_queue_changed)
+        del listener
+        gc.collect()
+        
+        await task_queue.add_task(TestDataFactory.create_download_task())
+        
+        assert task_queue._queue_callbacks == []
+    
+    @pytest.mark.asyncio
+    async def test_keep_alive_callback(self, task_queue):
+        """Test that keep_alive holds an otherwise unreferenced closure"""
+        statuses = []
+        task_queue.add_queue_callback(lambda status: statuses.append(status), keep_alive=True)
+        gc.collect()
+        
+        await task_queue.add_task(TestDataFactory.create_download_task())
+        
+        assert len(statuses) == 1
+    
+    @pytest.mark.asyncio
+    async def test_remove_callback(self, task_queue):
+        """Test removing a callback that is still alive"""
+        listener = _Listener()
+        task_queue.add_queue_callback(listener.on_queue_changed)
+        task_queue.remove_queue_callback(listener.on_queue_changed)
+        
+        await task_queue.add_task(TestDataFactory.create_download_task())
+        
+        assert listener.statuses == []
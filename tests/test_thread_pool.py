@@ -0,0 +1,186 @@
+"""
+Tests for the thread pool manager and its work-stealing executor.
+"""
+import asyncio
+import threading
+import time
+import concurrent.futures
+
+import pytest
+
+from app.core.downloader.thread_pool import ThreadPoolManager, WorkStealingExecutor
+
+
+class TestWorkStealingExecutor:
+    """Test WorkStealingExecutor under concurrent resizing"""
+    
+    @pytest.fixture
+    def executor(self):
+        """Create executor instance"""
+        executor = WorkStealingExecutor(max_workers=4, thread_name_prefix="TestWorker")
+        yield executor
+        executor.shutdown(wait=True)
+    
+    def test_resize_while_submitting(self, executor):
+        """Test that no task is lost while workers retire and steal"""
+        stop = threading.Event()
+        
+        def resize():
+            while not stop.is_set():
+                executor.add_workers(3)
+                time.sleep(0.001)
+                executor.request_shrink(3)
+        
+        resizer = threading.Thread(target=resize)
+        resizer.start()
+        try:
+            futures = [executor.submit(pow, i, 2) for i in range(20000)]
+            done, not_done = concurrent.futures.wait(futures, timeout=30)
+        finally:
+            stop.set()
+            resizer.join()
+        
+        assert not not_done
+        assert [f.result() for f in futures] == [i * i for i in range(20000)]
+    
+    def test_submit_from_many_threads(self, executor):
+        """Test that concurrent submitters all get their results"""
+        results = [None] * 8
+        
+        def submit_batch(index):
+            futures = [executor.submit(pow, i, 2) for i in range(2000)]
+            results[index] = [f.result(timeout=30) for f in futures]
+        
+        submitters = [threading.Thread(target=submit_batch, args=(i,)) for i in range(8)]
+        for thread in submitters:
+            thread.start()
+        for thread in submitters:
+            thread.join()
+        
+        assert results == [[i * i for i in range(2000)]] * 8
+    
+    def test_grow_and_shrink(self, executor):
+        """Test resizing keeps at least one worker and queued tasks run"""
+        executor.add_workers(4)
+        assert executor.num_workers == 8
+        
+        executor.request_shrink(100)
+        assert executor.num_workers == 1
+        
+        futures = [executor.submit(time.sleep, 0.001) for _ in range(50)]
+        done, not_done = concurrent.futures.wait(futures, timeout=30)
+        assert not not_done
+    
+    def test_shutdown_runs_queued_tasks(self):
+        """Test that shutdown(wait=True) finishes tasks that were already queued"""
+        executor = WorkStealingExecutor(max_workers=2)
+        futures = [executor.submit(time.sleep, 0.001) for _ in range(100)]
+        executor.shutdown(wait=True)
+        
+        assert all(f.done() and not f.cancelled() for f in futures)
+        with pytest.raises(RuntimeError):
+            executor.submit(pow, 2, 2)
+        with pytest.raises(RuntimeError):
+            executor.add_workers(1)
+    
+    def test_shutdown_cancel_futures(self):
+        """Test that shutdown can cancel tasks that have not started"""
+        executor = WorkStealingExecutor(max_workers=1)
+        release = threading.Event()
+        started = threading.Event()
+        
+        def block():
+            started.set()
+            release.wait(5)
+        
+        blocker = executor.submit(block)
+        started.wait(5)
+        pending = [executor.submit(pow, i, 2) for i in range(20)]
+        executor.shutdown(wait=False, cancel_futures=True)
+        release.set()
+        executor.shutdown(wait=True)
+        
+        assert blocker.result() is None
+        assert all(f.cancelled() for f in pending)
+
+
+class TestThreadPoolManager:
+    """Test ThreadPoolManager's sharded task table"""
+    
+    @pytest.fixture
+    def manager(self):
+        """Create thread pool manager instance"""
+        with ThreadPoolManager(max_workers=4, thread_name_prefix="TestPool") as manager:
+            yield manager
+    
+    @pytest.mark.asyncio
+    async def test_submit_and_wait(self, manager):
+        """Test that tasks spread over all shards are tracked and collected"""
+        task_ids = [f"task-{i}" for i in range(200)]
+        for i, task_id in enumerate(task_ids):
+            await manager.submit_task(task_id, pow, i, 2)
+        
+        results = [await manager.wait_for_task(task_id, timeout=30) for task_id in task_ids]
+        
+        assert results == [i * i for i in range(200)]
+        assert manager.get_active_task_ids() == []
+        assert manager.get_stats().completed_tasks == 200
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_task_id(self, manager):
+        """Test that an active task ID can't be submitted twice"""
+        release = threading.Event()
+        await manager.submit_task("task", release.wait, 5)
+        
+        with pytest.raises(ValueError):
+            await manager.submit_task("task", pow, 2, 2)
+        
+        release.set()
+        assert await manager.wait_for_task("task", timeout=30) is True
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_all(self, manager):
+        """Test collecting results and failures of all active tasks"""
+        for i in range(20):
+            await manager.submit_task(f"task-{i}", pow, i, 2)
+        await manager.submit_task("failing", int, "not a number")
+        
+        results = await manager.wait_for_all(timeout=30)
+        
+        assert sorted(r for r in results if isinstance(r, int)) == [i * i for i in range(20)]
+        assert sum(isinstance(r, ValueError) for r in results) == 1
+        assert manager.get_stats().failed_tasks == 1
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_failed_task(self, manager):
+        """Test that a task's exception is raised and the task is removed"""
+        await manager.submit_task("failing", int, "not a number")
+        
+        with pytest.raises(ValueError):
+            await manager.wait_for_task("failing", timeout=30)
+        assert not manager.is_task_active("failing")
+    
+    @pytest.mark.asyncio
+    async def test_cancel_queued_task(self):
+        """Test that a task that has not started can be cancelled"""
+        release = threading.Event()
+        started = threading.Event()
+        
+        def block():
+            started.set()
+            release.wait(5)
+        
+        with ThreadPoolManager(max_workers=1) as manager:
+            await manager.submit_task("blocker", block)
+            await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+            await manager.submit_task("queued", pow, 2, 2)
+            
+            assert await manager.cancel_task("queued")
+            assert not manager.is_task_active("queued")
+            assert not await manager.cancel_task("unknown")
+            with pytest.raises(KeyError):
+                await manager.wait_for_task("queued")
+            
+            release.set()
+            assert await manager.wait_for_task("blocker", timeout=30) is None
+            assert manager.get_active_task_ids() == []